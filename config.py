@@ -31,7 +31,11 @@ ASSETS_DIR = os.path.join(BASE_DIR, "assets")
 DATABASE_CONFIG = {
     "timeout": 30,              # Timeout connexion en secondes
     "check_same_thread": False, # Permettre accès multi-thread
-    "isolation_level": None     # Auto-commit désactivé
+    "isolation_level": None,    # Auto-commit désactivé
+    "journal_mode": "WAL",      # Lectures concurrentes pendant les écritures
+    "cached_statements": 256,   # Requêtes préparées gardées par connexion
+    "cache_size_kib": 20000,    # Cache de pages SQLite par connexion (Ko)
+    "read_pool_size": max(2, os.cpu_count() or 1)  # Connexions de lecture
 }
 
 # ============================================
@@ -345,6 +345,7 @@ class MedicamentController:
             List[dict]: Données formatées
         """
         medicaments = self.get_all_medicaments()
+        today = date.today()
         
         result = []
         for med in medicaments:
@@ -359,8 +360,8 @@ class MedicamentController:
                 'threshold': med.stock_threshold,
                 'expiration': med.expiration_date.strftime("%d/%m/%Y") if med.expiration_date else "-",
                 'is_low_stock': med.is_low_stock(),
-                'is_expiring': med.is_expiring_soon(),
-                'is_expired': med.is_expired()
+                'is_expiring': med.is_expiring_soon(today=today),
+                'is_expired': med.is_expired(today)
             })
         
         return result
\ No newline at end of file
@@ -72,6 +72,7 @@ class ReportController:
         # Médicaments en alerte
         low_stock = self._medicament_repo.get_low_stock()
         expiring = self._medicament_repo.get_expiring_soon()
+        today = date.today()
         
         data = {
             'total_products': stock_stats['total_products'],
@@ -94,7 +95,7 @@ class ReportController:
                 {
                     'name': m.name,
                     'expiration': m.expiration_date.strftime("%d/%m/%Y") if m.expiration_date else "",
-                    'days_left': m.days_until_expiry()
+                    'days_left': m.days_until_expiry(today)
                 }
                 for m in expiring[:5]
             ]
@@ -344,6 +345,7 @@ class ReportController:
             expired = []
         
         total_value = sum(m.quantity_in_stock * m.purchase_price for m in medicaments)
+        today = date.today()
         
         data = {
             'total_products': len(medicaments),
@@ -361,7 +363,7 @@ class ReportController:
                     'threshold': m.stock_threshold,
                     'value': m.quantity_in_stock * m.purchase_price,
                     'value_display': FormatUtils.format_currency(m.quantity_in_stock * m.purchase_price),
-                    'status': self._get_stock_status(m)
+                    'status': self._get_stock_status(m, today)
                 }
                 for m in medicaments
             ],
@@ -380,7 +382,7 @@ class ReportController:
                     'code': m.code,
                     'name': m.name,
                     'expiration': m.expiration_date.strftime("%d/%m/%Y") if m.expiration_date else "",
-                    'days_left': m.days_until_expiry() if hasattr(m, 'days_until_expiry') else 0,
+                    'days_left': m.days_until_expiry(today) if hasattr(m, 'days_until_expiry') else 0,
                     'quantity': m.quantity_in_stock
                 }
                 for m in expiring
@@ -389,16 +391,16 @@ class ReportController:
         
         return True, "", data
     
-    def _get_stock_status(self, medicament) -> str:
+    def _get_stock_status(self, medicament, today: Optional[date] = None) -> str:
         """Détermine le statut du stock."""
         try:
-            if hasattr(medicament, 'is_expired') and medicament.is_expired():
+            if medicament.is_expired(today):
                 return "⛔ Périmé"
-            if hasattr(medicament, 'is_expiring_soon') and medicament.is_expiring_soon():
+            if medicament.is_expiring_soon(today=today):
                 return "⚠️ Expire bientôt"
-            if hasattr(medicament, 'is_out_of_stock') and medicament.is_out_of_stock():
+            if medicament.is_out_of_stock():
                 return "❌ Rupture"
-            if hasattr(medicament, 'is_low_stock') and medicament.is_low_stock():
+            if medicament.is_low_stock():
                 return "⚠️ Stock faible"
             return "✅ OK"
         except Exception:
@@ -557,21 +559,16 @@ class ReportController:
         if not allowed:
             return False, message
         
-        products = self._sale_repo.get_top_products(start_date, end_date, limit)
+        products = self._sale_repo.iter_top_products(start_date, end_date, limit)
         
-        data = [
-            {
-                'Rang': i + 1,
-                'Code': p['code'],
-                'Nom': p['name'],
-                'Quantité vendue': p['total_quantity'],
-                'Chiffre d\'affaires': p['total_revenue']
-            }
-            for i, p in enumerate(products)
-        ]
+        headers = ['Rang', 'Code', 'Nom', 'Quantité vendue', 'Chiffre d\'affaires']
+        rows = (
+            (rank, code, name, quantity, revenue)
+            for rank, (_, code, name, quantity, revenue) in enumerate(products, start=1)
+        )
         
         try:
-            CSVExporter.export(data, filepath)
+            CSVExporter.export_rows(rows, filepath, headers)
             return True, f"Export réussi: {filepath}"
         except Exception as e:
             return False, f"Erreur d'export: {str(e)}"
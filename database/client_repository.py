@@ -8,6 +8,7 @@ Version: 1.0
 from typing import Optional, List
 from database.base_repository import BaseRepository
 from models.client import Client
+from models.dataclass_options import trusted_load
 
 
 class ClientRepository(BaseRepository[Client]):
@@ -45,8 +46,8 @@ class ClientRepository(BaseRepository[Client]):
             1 if client.is_active else 0
         )
         
-        self.db.execute(query, params)
-        client.id = self.db.get_last_insert_id()
+        cursor = self.db.execute(query, params)
+        client.id = cursor.lastrowid
         return client
     
     def get_by_id(self, client_id: int) -> Optional[Client]:
@@ -112,7 +113,8 @@ class ClientRepository(BaseRepository[Client]):
         """
         query = "SELECT * FROM clients WHERE is_active = 1 ORDER BY last_name, first_name"
         results = self.db.fetch_all(query)
-        return [Client.from_dict(row) for row in results]
+        with trusted_load():
+            return [Client.from_dict(row) for row in results]
     
     def search(self, keyword: str) -> List[Client]:
         """
@@ -138,7 +140,8 @@ class ClientRepository(BaseRepository[Client]):
         params = (pattern, pattern, pattern, pattern)
         
         results = self.db.fetch_all(query, params)
-        return [Client.from_dict(row) for row in results]
+        with trusted_load():
+            return [Client.from_dict(row) for row in results]
     
     def update(self, client: Client) -> bool:
         """
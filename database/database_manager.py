@@ -8,8 +8,10 @@ Version: 1.0
 
 import sqlite3
 import os
+import queue
 import threading
-from typing import Optional, List, Dict, Any, Tuple
+from contextlib import contextmanager
+from typing import Optional, List, Dict, Any, Tuple, Iterator
 
 # Import configuration
 import sys
@@ -17,12 +19,153 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from config import DATABASE_PATH, SCHEMA_PATH, DATABASE_CONFIG
 
 
+# Vue des ventes avec noms du client et du vendeur (source unique de sa
+# définition; les ventes dont le vendeur n'existe plus restent visibles)
+SALES_WITH_NAMES_VIEW = """
+    CREATE VIEW IF NOT EXISTS v_sales_with_names AS
+    SELECT
+        s.*,
+        c.first_name || ' ' || c.last_name AS client_name,
+        u.full_name AS seller_name
+    FROM sales s
+    LEFT JOIN clients c ON s.client_id = c.id
+    LEFT JOIN users u ON s.user_id = u.id
+"""
+
+# Mises à jour idempotentes appliquées à chaque démarrage, après schema.sql
+# pour une base neuve (schema.sql n'est exécuté qu'à la création de la base)
+SCHEMA_UPGRADES = (
+    # Recréée pour remplacer une définition antérieure de la vue
+    "DROP VIEW IF EXISTS v_sales_with_names",
+    SALES_WITH_NAMES_VIEW,
+    """
+    CREATE INDEX IF NOT EXISTS idx_stock_movements_medicament_date
+    ON stock_movements(medicament_id, created_at DESC)
+    """,
+)
+
+
+class SqlitePool:
+    """
+    Pool de connexions SQLite dédiées à la lecture.
+    
+    Les connexions sont ouvertes à la demande jusqu'à la taille maximale
+    puis réutilisées. En mode WAL, elles lisent en parallèle de la
+    connexion d'écriture sans la bloquer. Si toutes sont occupées,
+    l'attente est limitée au timeout de la configuration.
+    
+    Usage:
+        with pool.acquire() as conn:
+            conn.execute("SELECT ...")
+    """
+    
+    def __init__(self, database_path: str, size: int):
+        """
+        Initialise le pool.
+        
+        Args:
+            database_path: Chemin du fichier de base de données
+            size: Nombre maximal de connexions
+        """
+        self._database_path = database_path
+        self._size = max(1, size)
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._connections: List[sqlite3.Connection] = []
+        self._lock = threading.Lock()
+    
+    def _open(self) -> sqlite3.Connection:
+        """Ouvre une nouvelle connexion de lecture."""
+        connection = sqlite3.connect(
+            self._database_path,
+            timeout=DATABASE_CONFIG["timeout"],
+            check_same_thread=False,
+            cached_statements=DATABASE_CONFIG["cached_statements"]
+        )
+        connection.execute("PRAGMA query_only = ON")
+        connection.execute(
+            f"PRAGMA cache_size = -{DATABASE_CONFIG['cache_size_kib']}"
+        )
+        connection.row_factory = sqlite3.Row
+        return connection
+    
+    @contextmanager
+    def acquire(self) -> Iterator[sqlite3.Connection]:
+        """
+        Emprunte une connexion du pool et la restitue en sortie de bloc.
+        
+        Yields:
+            sqlite3.Connection: Connexion de lecture
+            
+        Raises:
+            sqlite3.OperationalError: Si aucune connexion ne se libère à temps
+        """
+        try:
+            connection = self._idle.get_nowait()
+        except queue.Empty:
+            connection = None
+            with self._lock:
+                if len(self._connections) < self._size:
+                    connection = self._open()
+                    self._connections.append(connection)
+            if connection is None:
+                try:
+                    connection = self._idle.get(timeout=DATABASE_CONFIG["timeout"])
+                except queue.Empty:
+                    raise sqlite3.OperationalError(
+                        "Aucune connexion de lecture disponible"
+                    ) from None
+        
+        try:
+            yield connection
+        finally:
+            self._release(connection)
+    
+    @contextmanager
+    def dedicated(self) -> Iterator[sqlite3.Connection]:
+        """
+        Ouvre une connexion de lecture hors pool, fermée en sortie de bloc.
+        
+        Réservée aux lectures de longue durée (itérateurs) qui ne doivent
+        pas immobiliser une connexion du pool.
+        
+        Yields:
+            sqlite3.Connection: Connexion de lecture
+        """
+        connection = self._open()
+        try:
+            yield connection
+        finally:
+            connection.close()
+    
+    def _release(self, connection: sqlite3.Connection) -> None:
+        """
+        Restitue une connexion au pool.
+        
+        Une connexion empruntée avant close() n'appartient plus au pool:
+        elle est fermée au lieu d'être remise en file.
+        """
+        with self._lock:
+            if any(connection is known for known in self._connections):
+                self._idle.put(connection)
+                return
+        connection.close()
+    
+    def close(self) -> None:
+        """Ferme toutes les connexions du pool."""
+        with self._lock:
+            for connection in self._connections:
+                connection.close()
+            self._connections.clear()
+            self._idle = queue.LifoQueue()
+
+
 class DatabaseManager:
     """
     Gestionnaire singleton de la connexion SQLite.
     
     Responsabilités:
-    - Maintenir une connexion unique à la base de données
+    - Maintenir une connexion unique d'écriture à la base de données
+    - Fournir un pool de connexions de lecture (mode WAL)
     - Fournir des méthodes d'exécution de requêtes sécurisées
     - Gérer les transactions
     - Initialiser le schéma si nécessaire
@@ -60,6 +203,12 @@ class DatabaseManager:
             return
             
         self._connection: Optional[sqlite3.Connection] = None
+        self._pool: Optional[SqlitePool] = None
+        
+        # Les écritures et les transactions sont sérialisées entre threads;
+        # chaque thread sait s'il est dans son propre bloc transaction()
+        self._write_lock = threading.RLock()
+        self._local = threading.local()
         self._initialized = True
         self._connect()
     
@@ -81,18 +230,35 @@ class DatabaseManager:
             self._connection = sqlite3.connect(
                 DATABASE_PATH,
                 timeout=DATABASE_CONFIG["timeout"],
-                check_same_thread=DATABASE_CONFIG["check_same_thread"]
+                check_same_thread=DATABASE_CONFIG["check_same_thread"],
+                cached_statements=DATABASE_CONFIG["cached_statements"]
             )
             
             # Activer les clés étrangères
             self._connection.execute("PRAGMA foreign_keys = ON")
             
+            # Cache de pages (valeur négative = taille en Ko)
+            self._connection.execute(
+                f"PRAGMA cache_size = -{DATABASE_CONFIG['cache_size_kib']}"
+            )
+            
+            # Mode WAL: les lectures ne bloquent pas l'écriture
+            self._connection.execute(
+                f"PRAGMA journal_mode = {DATABASE_CONFIG['journal_mode']}"
+            )
+            
             # Configurer pour retourner des dictionnaires
             self._connection.row_factory = sqlite3.Row
             
             # Initialiser le schéma si base vide
             self._initialize_schema()
             
+            # Pool de lecture, ouvert après l'initialisation du schéma
+            self._pool = SqlitePool(
+                DATABASE_PATH,
+                DATABASE_CONFIG["read_pool_size"]
+            )
+            
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Erreur de connexion à la base de données: {e}")
     
@@ -114,6 +280,17 @@ class DatabaseManager:
                     schema_sql = schema_file.read()
                     self._connection.executescript(schema_sql)
                     self._connection.commit()
+        
+        self._upgrade_schema()
+    
+    def _upgrade_schema(self) -> None:
+        """
+        Applique les mises à jour de schéma (vues, index) définies hors
+        de schema.sql.
+        """
+        for statement in SCHEMA_UPGRADES:
+            self._connection.execute(statement)
+        self._connection.commit()
     
     @property
     def connection(self) -> sqlite3.Connection:
@@ -127,6 +304,51 @@ class DatabaseManager:
             self._connect()
         return self._connection
     
+    @property
+    def pool(self) -> SqlitePool:
+        """
+        Retourne le pool de connexions de lecture.
+        
+        Returns:
+            SqlitePool: Pool de lecture
+        """
+        if self._pool is None:
+            self._connect()
+        return self._pool
+    
+    def _in_transaction_block(self) -> bool:
+        """Indique si le thread courant est dans un bloc transaction()."""
+        return getattr(self._local, "in_transaction", False)
+    
+    @contextmanager
+    def _reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Fournit une connexion pour une lecture.
+        
+        Dans son bloc transaction(), un thread lit par la connexion
+        d'écriture pour voir ses modifications non encore validées.
+        Les autres threads lisent l'état validé via le pool.
+        """
+        if self._in_transaction_block():
+            yield self.connection
+        else:
+            with self.pool.acquire() as reader:
+                yield reader
+    
+    @contextmanager
+    def _stream_reader(self) -> Iterator[sqlite3.Connection]:
+        """
+        Fournit une connexion pour une lecture itérative.
+        
+        Hors transaction, une connexion dédiée est ouverte afin qu'un
+        itérateur non consommé n'immobilise pas le pool.
+        """
+        if self._in_transaction_block():
+            yield self.connection
+        else:
+            with self.pool.dedicated() as reader:
+                yield reader
+    
     def execute(
         self, 
         query: str, 
@@ -145,14 +367,16 @@ class DatabaseManager:
         Raises:
             sqlite3.Error: En cas d'erreur d'exécution
         """
-        try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, parameters)
-            self.connection.commit()
-            return cursor
-        except sqlite3.Error as e:
-            self.connection.rollback()
-            raise sqlite3.Error(f"Erreur d'exécution de la requête: {e}")
+        with self._write_lock:
+            try:
+                cursor = self.connection.cursor()
+                cursor.execute(query, parameters)
+                if not self._in_transaction_block():
+                    self.connection.commit()
+                return cursor
+            except sqlite3.Error as e:
+                self.connection.rollback()
+                raise sqlite3.Error(f"Erreur d'exécution de la requête: {e}")
     
     def execute_many(
         self, 
@@ -172,14 +396,16 @@ class DatabaseManager:
         Raises:
             sqlite3.Error: En cas d'erreur d'exécution
         """
-        try:
-            cursor = self.connection.cursor()
-            cursor.executemany(query, parameters_list)
-            self.connection.commit()
-            return cursor
-        except sqlite3.Error as e:
-            self.connection.rollback()
-            raise sqlite3.Error(f"Erreur d'exécution multiple: {e}")
+        with self._write_lock:
+            try:
+                cursor = self.connection.cursor()
+                cursor.executemany(query, parameters_list)
+                if not self._in_transaction_block():
+                    self.connection.commit()
+                return cursor
+            except sqlite3.Error as e:
+                self.connection.rollback()
+                raise sqlite3.Error(f"Erreur d'exécution multiple: {e}")
     
     def fetch_one(
         self, 
@@ -197,9 +423,10 @@ class DatabaseManager:
             Optional[Dict]: Dictionnaire du résultat ou None
         """
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, parameters)
-            row = cursor.fetchone()
+            with self._reader() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query, parameters)
+                row = cursor.fetchone()
             
             if row is None:
                 return None
@@ -226,9 +453,10 @@ class DatabaseManager:
             List[Dict]: Liste de dictionnaires des résultats
         """
         try:
-            cursor = self.connection.cursor()
-            cursor.execute(query, parameters)
-            rows = cursor.fetchall()
+            with self._reader() as connection:
+                cursor = connection.cursor()
+                cursor.execute(query, parameters)
+                rows = cursor.fetchall()
             
             # Convertir chaque Row en dictionnaire
             return [dict(row) for row in rows]
@@ -236,16 +464,69 @@ class DatabaseManager:
         except sqlite3.Error as e:
             raise sqlite3.Error(f"Erreur de lecture multiple: {e}")
     
-    def get_last_insert_id(self) -> int:
+    def fetch_rows(
+        self,
+        query: str,
+        parameters: Tuple = ()
+    ) -> Tuple[Dict[str, int], List[tuple]]:
         """
-        Retourne l'ID du dernier enregistrement inséré.
+        Exécute une requête SELECT et retourne les résultats sous forme de tuples.
+        
+        Plus économique que fetch_all pour les listes volumineuses: aucun
+        dictionnaire n'est construit par ligne.
+        
+        Args:
+            query: Requête SQL SELECT paramétrée
+            parameters: Tuple des paramètres
         
         Returns:
-            int: ID du dernier INSERT
+            Tuple[Dict[str, int], List[tuple]]: (index des colonnes, lignes)
         """
-        cursor = self.connection.cursor()
-        cursor.execute("SELECT last_insert_rowid()")
-        return cursor.fetchone()[0]
+        try:
+            with self._reader() as connection:
+                cursor = connection.cursor()
+                cursor.row_factory = None
+                cursor.execute(query, parameters)
+                rows = cursor.fetchall()
+            
+            columns = {
+                description[0]: position
+                for position, description in enumerate(cursor.description)
+            }
+            return columns, rows
+        
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Erreur de lecture multiple: {e}")
+    
+    def fetch_iter(
+        self,
+        query: str,
+        parameters: Tuple = ()
+    ) -> Iterator[tuple]:
+        """
+        Exécute une requête SELECT et itère sur les résultats sans les
+        charger tous en mémoire.
+        
+        Les lignes sont retournées sous forme de tuples, dans l'ordre des
+        colonnes de la requête. La lecture utilise une connexion dédiée,
+        fermée quand l'itérateur est épuisé ou libéré.
+        
+        Args:
+            query: Requête SQL SELECT paramétrée
+            parameters: Tuple des paramètres
+            
+        Yields:
+            tuple: Ligne de résultat
+        """
+        try:
+            with self._stream_reader() as connection:
+                cursor = connection.cursor()
+                cursor.row_factory = None
+                cursor.execute(query, parameters)
+                yield from cursor
+            
+        except sqlite3.Error as e:
+            raise sqlite3.Error(f"Erreur de lecture multiple: {e}")
     
     def begin_transaction(self) -> None:
         """
@@ -265,6 +546,33 @@ class DatabaseManager:
         """
         self.connection.rollback()
     
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """
+        Regroupe plusieurs écritures dans une seule transaction.
+        
+        Dans le bloc, execute() et execute_many() ne valident plus chaque
+        requête: l'ensemble est validé à la sortie du bloc, ou annulé si
+        une exception est levée. Les écritures des autres threads attendent
+        la fin du bloc.
+        
+        Usage:
+            with db.transaction():
+                db.execute(...)
+                db.execute_many(...)
+        """
+        with self._write_lock:
+            self.begin_transaction()
+            self._local.in_transaction = True
+            try:
+                yield
+            except BaseException:
+                self._local.in_transaction = False
+                self.rollback()
+                raise
+            self._local.in_transaction = False
+            self.commit()
+    
     def table_exists(self, table_name: str) -> bool:
         """
         Vérifie si une table existe dans la base de données.
@@ -284,8 +592,12 @@ class DatabaseManager:
     
     def close(self) -> None:
         """
-        Ferme la connexion à la base de données.
+        Ferme la connexion à la base de données et le pool de lecture.
         """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool = None
+        
         if self._connection is not None:
             self._connection.close()
             self._connection = None
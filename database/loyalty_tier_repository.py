@@ -5,16 +5,31 @@ Auteur: Alsény Camara
 Version: 1.0
 """
 
-from typing import Optional, List
+import time
+from typing import Optional, List, Tuple
 from database.base_repository import BaseRepository
 from models.loyalty_tier import LoyaltyTier
+from models.dataclass_options import trusted_load
 
 
 class LoyaltyTierRepository(BaseRepository[LoyaltyTier]):
     """
     Repository pour les opérations sur les paliers de fidélité.
+    
+    La table des paliers actifs est mise en cache (partagé entre les
+    instances, durée de vie limitée) et invalidée à chaque création,
+    modification ou suppression.
     """
     
+    # Cache de la table des paliers: (expiration, (seuils, paliers))
+    TIERS_CACHE_TTL_SECONDS = 60
+    _tiers_cache: Optional[Tuple[float, Tuple[List[int], List[LoyaltyTier]]]] = None
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Vide le cache des paliers."""
+        cls._tiers_cache = None
+    
     def create(self, tier: LoyaltyTier) -> LoyaltyTier:
         """Crée un nouveau palier."""
         query = """
@@ -29,8 +44,9 @@ class LoyaltyTierRepository(BaseRepository[LoyaltyTier]):
             1 if tier.is_active else 0
         )
         
-        self.db.execute(query, params)
-        tier.id = self.db.get_last_insert_id()
+        cursor = self.db.execute(query, params)
+        tier.id = cursor.lastrowid
+        self.clear_cache()
         return tier
     
     def get_by_id(self, tier_id: int) -> Optional[LoyaltyTier]:
@@ -47,7 +63,30 @@ class LoyaltyTierRepository(BaseRepository[LoyaltyTier]):
         """Récupère tous les paliers actifs."""
         query = "SELECT * FROM loyalty_tiers WHERE is_active = 1 ORDER BY min_points"
         results = self.db.fetch_all(query)
-        return [LoyaltyTier.from_dict(row) for row in results]
+        with trusted_load():
+            return [LoyaltyTier.from_dict(row) for row in results]
+    
+    def get_tier_table(self) -> Tuple[List[int], List[LoyaltyTier]]:
+        """
+        Retourne la table des paliers actifs triés par seuil (en cache).
+        
+        Les listes retournées sont partagées et ne doivent pas être modifiées.
+        
+        Returns:
+            Tuple[List[int], List[LoyaltyTier]]: (seuils de points, paliers)
+        """
+        cached = LoyaltyTierRepository._tiers_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        
+        tiers = self.get_all()
+        table = ([tier.min_points for tier in tiers], tiers)
+        
+        LoyaltyTierRepository._tiers_cache = (
+            time.monotonic() + self.TIERS_CACHE_TTL_SECONDS,
+            table
+        )
+        return table
     
     def get_tier_for_points(self, points: int) -> Optional[LoyaltyTier]:
         """
@@ -90,10 +129,12 @@ class LoyaltyTierRepository(BaseRepository[LoyaltyTier]):
         )
         
         cursor = self.db.execute(query, params)
+        self.clear_cache()
         return cursor.rowcount > 0
     
     def delete(self, tier_id: int) -> bool:
         """Désactive un palier."""
         query = "UPDATE loyalty_tiers SET is_active = 0 WHERE id = ?"
         cursor = self.db.execute(query, (tier_id,))
+        self.clear_cache()
         return cursor.rowcount > 0
\ No newline at end of file
@@ -5,9 +5,11 @@ Auteur: Alsény Camara
 Version: 1.0
 """
 
-from typing import Optional, List
+import time
+from typing import Optional, List, Tuple, Iterator, Dict, Any
 from database.base_repository import BaseRepository
 from models.medicament import Medicament
+from models.dataclass_options import trusted_load
 
 
 class MedicamentRepository(BaseRepository[Medicament]):
@@ -15,8 +17,21 @@ class MedicamentRepository(BaseRepository[Medicament]):
     Repository pour les opérations CRUD sur les médicaments.
     
     Gère l'accès aux données de la table 'medicaments'.
+    
+    La liste des catégories est mise en cache (partagé entre les
+    instances, durée de vie limitée) et invalidée à chaque création,
+    modification ou suppression.
     """
     
+    # Cache des catégories: (expiration, catégories)
+    CATEGORIES_CACHE_TTL_SECONDS = 60
+    _categories_cache: Optional[Tuple[float, List[str]]] = None
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Vide le cache des catégories."""
+        cls._categories_cache = None
+    
     def create(self, medicament: Medicament) -> Medicament:
         """
         Crée un nouveau médicament.
@@ -48,8 +63,9 @@ class MedicamentRepository(BaseRepository[Medicament]):
             1 if medicament.is_active else 0
         )
         
-        self.db.execute(query, params)
-        medicament.id = self.db.get_last_insert_id()
+        cursor = self.db.execute(query, params)
+        medicament.id = cursor.lastrowid
+        self.clear_cache()
         return medicament
     
     def get_by_id(self, medicament_id: int) -> Optional[Medicament]:
@@ -70,6 +86,25 @@ class MedicamentRepository(BaseRepository[Medicament]):
         
         return Medicament.from_dict(result)
     
+    def get_by_ids(self, medicament_ids: List[int]) -> Dict[int, Medicament]:
+        """
+        Récupère plusieurs médicaments en une seule requête.
+        
+        Args:
+            medicament_ids: IDs des médicaments
+            
+        Returns:
+            Dict[int, Medicament]: Médicaments par ID (les IDs inconnus sont absents)
+        """
+        if not medicament_ids:
+            return {}
+        
+        placeholders = ", ".join("?" * len(medicament_ids))
+        query = f"SELECT * FROM medicaments WHERE id IN ({placeholders})"
+        results = self.db.fetch_all(query, tuple(medicament_ids))
+        with trusted_load():
+            return {row['id']: Medicament.from_dict(row) for row in results}
+    
     def get_by_code(self, code: str) -> Optional[Medicament]:
         """
         Récupère un médicament par son code.
@@ -97,7 +132,27 @@ class MedicamentRepository(BaseRepository[Medicament]):
         """
         query = "SELECT * FROM medicaments WHERE is_active = 1 ORDER BY name"
         results = self.db.fetch_all(query)
-        return [Medicament.from_dict(row) for row in results]
+        with trusted_load():
+            return [Medicament.from_dict(row) for row in results]
+    
+    def iter_stock_rows(self) -> Iterator[Tuple[str, str, Optional[str], int, float, float, Optional[str]]]:
+        """
+        Itère sur les médicaments actifs sans matérialiser la liste.
+        
+        Destiné aux exports volumineux de l'état du stock.
+        
+        Yields:
+            tuple: (code, nom, catégorie, quantité, prix d'achat,
+                prix de vente, date de péremption ISO)
+        """
+        query = """
+            SELECT code, name, category, quantity_in_stock,
+                   purchase_price, selling_price, expiration_date
+            FROM medicaments
+            WHERE is_active = 1
+            ORDER BY name
+        """
+        return self.db.fetch_iter(query)
     
     def get_all_including_inactive(self) -> List[Medicament]:
         """
@@ -108,7 +163,8 @@ class MedicamentRepository(BaseRepository[Medicament]):
         """
         query = "SELECT * FROM medicaments ORDER BY is_active DESC, name"
         results = self.db.fetch_all(query)
-        return [Medicament.from_dict(row) for row in results]
+        with trusted_load():
+            return [Medicament.from_dict(row) for row in results]
     
     def search(
         self, 
@@ -149,7 +205,8 @@ class MedicamentRepository(BaseRepository[Medicament]):
         """
         
         results = self.db.fetch_all(query, tuple(params))
-        return [Medicament.from_dict(row) for row in results]
+        with trusted_load():
+            return [Medicament.from_dict(row) for row in results]
     
     def get_low_stock(self) -> List[Medicament]:
         """
@@ -164,7 +221,8 @@ class MedicamentRepository(BaseRepository[Medicament]):
             ORDER BY quantity_in_stock ASC
         """
         results = self.db.fetch_all(query)
-        return [Medicament.from_dict(row) for row in results]
+        with trusted_load():
+            return [Medicament.from_dict(row) for row in results]
     
     def get_expiring_soon(self, days: int = 30) -> List[Medicament]:
         """
@@ -184,7 +242,8 @@ class MedicamentRepository(BaseRepository[Medicament]):
             ORDER BY expiration_date ASC
         """
         results = self.db.fetch_all(query, (days,))
-        return [Medicament.from_dict(row) for row in results]
+        with trusted_load():
+            return [Medicament.from_dict(row) for row in results]
     
     def get_expired(self) -> List[Medicament]:
         """
@@ -201,7 +260,60 @@ class MedicamentRepository(BaseRepository[Medicament]):
             ORDER BY expiration_date ASC
         """
         results = self.db.fetch_all(query)
-        return [Medicament.from_dict(row) for row in results]
+        with trusted_load():
+            return [Medicament.from_dict(row) for row in results]
+    
+    def get_alert_candidates(
+        self,
+        days: int = 30
+    ) -> Tuple[List[Medicament], List[Medicament], List[Medicament]]:
+        """
+        Récupère en une requête les médicaments concernés par une alerte.
+        
+        Les conditions sont celles de get_low_stock, get_expired et
+        get_expiring_soon, évaluées en un seul parcours de la table. Un
+        médicament peut figurer dans plusieurs listes.
+        
+        Args:
+            days: Nombre de jours avant péremption
+            
+        Returns:
+            Tuple[List[Medicament], List[Medicament], List[Medicament]]:
+                (stock faible par quantité croissante,
+                 périmés et expirant bientôt par date de péremption)
+        """
+        query = """
+            SELECT * FROM (
+                SELECT *,
+                    quantity_in_stock <= stock_threshold AS alert_low_stock,
+                    expiration_date IS NOT NULL
+                        AND expiration_date < DATE('now') AS alert_expired,
+                    expiration_date IS NOT NULL
+                        AND julianday(expiration_date) - julianday('now')
+                            BETWEEN 0 AND ? AS alert_expiring
+                FROM medicaments
+                WHERE is_active = 1
+            )
+            WHERE alert_low_stock OR alert_expired OR alert_expiring
+            ORDER BY id
+        """
+        results = self.db.fetch_all(query, (days,))
+        
+        low_stock, expired, expiring = [], [], []
+        with trusted_load():
+            for row in results:
+                medicament = Medicament.from_dict(row)
+                if row['alert_low_stock']:
+                    low_stock.append(medicament)
+                if row['alert_expired']:
+                    expired.append(medicament)
+                if row['alert_expiring']:
+                    expiring.append(medicament)
+        
+        low_stock.sort(key=lambda m: m.quantity_in_stock)
+        expired.sort(key=lambda m: m.expiration_date)
+        expiring.sort(key=lambda m: m.expiration_date)
+        return low_stock, expired, expiring
     
     def get_categories(self) -> List[str]:
         """
@@ -210,13 +322,23 @@ class MedicamentRepository(BaseRepository[Medicament]):
         Returns:
             List[str]: Liste des catégories
         """
+        cached = MedicamentRepository._categories_cache
+        if cached is not None and cached[0] > time.monotonic():
+            return list(cached[1])
+        
         query = """
             SELECT DISTINCT category FROM medicaments 
             WHERE category IS NOT NULL AND category != '' AND is_active = 1
             ORDER BY category
         """
         results = self.db.fetch_all(query)
-        return [row['category'] for row in results]
+        categories = [row['category'] for row in results]
+        
+        MedicamentRepository._categories_cache = (
+            time.monotonic() + self.CATEGORIES_CACHE_TTL_SECONDS,
+            categories
+        )
+        return list(categories)
     
     def update(self, medicament: Medicament) -> bool:
         """
@@ -252,8 +374,30 @@ class MedicamentRepository(BaseRepository[Medicament]):
         )
         
         cursor = self.db.execute(query, params)
+        self.clear_cache()
         return cursor.rowcount > 0
     
+    def get_stocks_for_ids(self, medicament_ids: List[int]) -> Dict[int, int]:
+        """
+        Récupère en une requête le stock de plusieurs médicaments.
+        
+        Args:
+            medicament_ids: IDs des médicaments
+            
+        Returns:
+            Dict[int, int]: Stock par ID (les IDs inconnus sont absents)
+        """
+        if not medicament_ids:
+            return {}
+        
+        placeholders = ", ".join("?" * len(medicament_ids))
+        query = f"""
+            SELECT id, quantity_in_stock FROM medicaments
+            WHERE id IN ({placeholders})
+        """
+        _, rows = self.db.fetch_rows(query, tuple(medicament_ids))
+        return dict(rows)
+    
     def update_stock(self, medicament_id: int, quantity_change: int) -> bool:
         """
         Met à jour la quantité en stock.
@@ -273,6 +417,27 @@ class MedicamentRepository(BaseRepository[Medicament]):
         cursor = self.db.execute(query, (quantity_change, medicament_id, quantity_change))
         return cursor.rowcount > 0
     
+    def decrement_stocks(self, quantities: List[Tuple[int, int]]) -> bool:
+        """
+        Retire du stock pour plusieurs médicaments en une seule requête.
+        
+        Args:
+            quantities: Liste de tuples (ID du médicament, quantité à retirer)
+            
+        Returns:
+            bool: True si tous les stocks ont été mis à jour
+        """
+        query = """
+            UPDATE medicaments 
+            SET quantity_in_stock = quantity_in_stock - ?
+            WHERE id = ? AND quantity_in_stock >= ?
+        """
+        cursor = self.db.execute_many(query, [
+            (quantity, medicament_id, quantity)
+            for medicament_id, quantity in quantities
+        ])
+        return cursor.rowcount == len(quantities)
+    
     def delete(self, medicament_id: int) -> bool:
         """
         Désactive un médicament (suppression logique).
@@ -285,6 +450,7 @@ class MedicamentRepository(BaseRepository[Medicament]):
         """
         query = "UPDATE medicaments SET is_active = 0 WHERE id = ?"
         cursor = self.db.execute(query, (medicament_id,))
+        self.clear_cache()
         return cursor.rowcount > 0
     
     def code_exists(self, code: str, exclude_id: Optional[int] = None) -> bool:
@@ -340,4 +506,32 @@ class MedicamentRepository(BaseRepository[Medicament]):
             FROM medicaments WHERE is_active = 1
         """
         result = self.db.fetch_one(query)
-        return result['total'] if result and result['total'] else 0.0
\ No newline at end of file
+        return result['total'] if result and result['total'] else 0.0
+    
+    def get_stock_summary(self, days: int = 30) -> Dict[str, Any]:
+        """
+        Calcule en une requête les indicateurs du stock actif.
+        
+        Les conditions sont celles de count_total, count_low_stock,
+        count_expiring_soon et get_total_stock_value.
+        
+        Args:
+            days: Nombre de jours avant péremption
+            
+        Returns:
+            Dict[str, Any]: total_products, low_stock_count,
+                expiring_soon_count et total_value
+        """
+        query = """
+            SELECT
+                COUNT(*) AS total_products,
+                COALESCE(SUM(quantity_in_stock <= stock_threshold), 0) AS low_stock_count,
+                COALESCE(SUM(
+                    expiration_date IS NOT NULL
+                    AND julianday(expiration_date) - julianday('now') BETWEEN 0 AND ?
+                ), 0) AS expiring_soon_count,
+                COALESCE(SUM(quantity_in_stock * purchase_price), 0.0) AS total_value
+            FROM medicaments
+            WHERE is_active = 1
+        """
+        return self.db.fetch_one(query, (days,))
\ No newline at end of file
@@ -5,11 +5,30 @@ Auteur: Alsény Camara
 Version: 1.0
 """
 
-from typing import Optional, List, Tuple
+from typing import Optional, List, Tuple, Iterator
 from datetime import datetime, date
 from database.base_repository import BaseRepository
 from models.sale import Sale
 from models.sale_line import SaleLine
+from models.dataclass_options import trusted_load
+
+
+# Produits les plus vendus sur une période (paramètres: début, fin, limite)
+_TOP_PRODUCTS_QUERY = """
+    SELECT 
+        m.id, m.code, m.name,
+        SUM(sl.quantity) AS total_quantity,
+        SUM(sl.line_total) AS total_revenue
+    FROM sale_lines sl
+    INNER JOIN sales s ON sl.sale_id = s.id
+    INNER JOIN medicaments m ON sl.medicament_id = m.id
+    WHERE DATE(s.sale_date) BETWEEN ? AND ?
+        AND s.status = 'completed'
+    GROUP BY m.id, m.code, m.name
+    ORDER BY total_quantity DESC
+    LIMIT ?
+"""
+_TOP_PRODUCTS_COLUMNS = ('id', 'code', 'name', 'total_quantity', 'total_revenue')
 
 
 class SaleRepository(BaseRepository[Sale]):
@@ -49,8 +68,8 @@ class SaleRepository(BaseRepository[Sale]):
             sale.status
         )
         
-        self.db.execute(query, params)
-        sale.id = self.db.get_last_insert_id()
+        cursor = self.db.execute(query, params)
+        sale.id = cursor.lastrowid
         
         # Insérer les lignes de vente
         if sale.lines:
@@ -88,7 +107,7 @@ class SaleRepository(BaseRepository[Sale]):
             return None
         
         sale = Sale.from_dict(result)
-        sale.lines = self.get_lines(sale_id)
+        sale.set_lines(self.get_lines(sale_id))
         return sale
     
     def get_by_number(self, sale_number: str) -> Optional[Sale]:
@@ -108,7 +127,7 @@ class SaleRepository(BaseRepository[Sale]):
             return None
         
         sale = Sale.from_dict(result)
-        sale.lines = self.get_lines(sale.id)
+        sale.set_lines(self.get_lines(sale.id))
         return sale
     
     def get_lines(self, sale_id: int) -> List[SaleLine]:
@@ -120,27 +139,43 @@ class SaleRepository(BaseRepository[Sale]):
             WHERE sl.sale_id = ?
             ORDER BY sl.id
         """
-        results = self.db.fetch_all(query, (sale_id,))
-        return [SaleLine.from_dict(row) for row in results]
+        columns, rows = self.db.fetch_rows(query, (sale_id,))
+        with trusted_load():
+            return [SaleLine.from_row(row, columns) for row in rows]
     
-    def get_all(self) -> List[Sale]:
-        """Récupère toutes les ventes."""
-        query = """
-            SELECT s.*, 
-                   c.first_name || ' ' || c.last_name AS client_name,
-                   u.full_name AS seller_name
-            FROM sales s
-            LEFT JOIN clients c ON s.client_id = c.id
-            INNER JOIN users u ON s.user_id = u.id
+    def _fetch_sales(self, query: str, parameters: Tuple = ()) -> List[Sale]:
+        """Exécute une requête de liste et construit les ventes depuis des tuples."""
+        columns, rows = self.db.fetch_rows(query, parameters)
+        with trusted_load():
+            return [Sale.from_row(row, columns) for row in rows]
+    
+    def _sales_source(self, include_names: bool) -> str:
+        """
+        Retourne la source FROM des requêtes de liste.
+        
+        Sans les noms, la requête porte directement sur la table sales
+        et évite les jointures clients/users.
+        """
+        return "v_sales_with_names s" if include_names else "sales s"
+    
+    def get_all(self, include_names: bool = True) -> List[Sale]:
+        """
+        Récupère toutes les ventes.
+        
+        Args:
+            include_names: Inclure les noms du client et du vendeur
+        """
+        query = f"""
+            SELECT s.* FROM {self._sales_source(include_names)}
             ORDER BY s.sale_date DESC
         """
-        results = self.db.fetch_all(query)
-        return [Sale.from_dict(row) for row in results]
+        return self._fetch_sales(query)
     
     def get_by_date_range(
         self, 
         start_date: date, 
-        end_date: date
+        end_date: date,
+        include_names: bool = True
     ) -> List[Sale]:
         """
         Récupère les ventes sur une période.
@@ -148,42 +183,37 @@ class SaleRepository(BaseRepository[Sale]):
         Args:
             start_date: Date de début
             end_date: Date de fin
+            include_names: Inclure les noms du client et du vendeur
             
         Returns:
             List[Sale]: Ventes de la période
         """
-        query = """
-            SELECT s.*, 
-                   c.first_name || ' ' || c.last_name AS client_name,
-                   u.full_name AS seller_name
-            FROM sales s
-            LEFT JOIN clients c ON s.client_id = c.id
-            INNER JOIN users u ON s.user_id = u.id
+        query = f"""
+            SELECT s.* FROM {self._sales_source(include_names)}
             WHERE DATE(s.sale_date) BETWEEN ? AND ?
             ORDER BY s.sale_date DESC
         """
-        results = self.db.fetch_all(query, (start_date.isoformat(), end_date.isoformat()))
-        return [Sale.from_dict(row) for row in results]
+        return self._fetch_sales(query, (start_date.isoformat(), end_date.isoformat()))
     
     def get_today_sales(self) -> List[Sale]:
         """Récupère les ventes du jour."""
         today = date.today()
         return self.get_by_date_range(today, today)
     
-    def get_by_client(self, client_id: int) -> List[Sale]:
-        """Récupère les ventes d'un client."""
-        query = """
-            SELECT s.*, 
-                   c.first_name || ' ' || c.last_name AS client_name,
-                   u.full_name AS seller_name
-            FROM sales s
-            LEFT JOIN clients c ON s.client_id = c.id
-            INNER JOIN users u ON s.user_id = u.id
+    def get_by_client(self, client_id: int, include_names: bool = True) -> List[Sale]:
+        """
+        Récupère les ventes d'un client.
+        
+        Args:
+            client_id: ID du client
+            include_names: Inclure les noms du client et du vendeur
+        """
+        query = f"""
+            SELECT s.* FROM {self._sales_source(include_names)}
             WHERE s.client_id = ?
             ORDER BY s.sale_date DESC
         """
-        results = self.db.fetch_all(query, (client_id,))
-        return [Sale.from_dict(row) for row in results]
+        return self._fetch_sales(query, (client_id,))
     
     def update(self, sale: Sale) -> bool:
         """Met à jour une vente."""
@@ -273,6 +303,34 @@ class SaleRepository(BaseRepository[Sale]):
         result = self.db.fetch_one(query, (target_date.isoformat(),))
         return result['count'] if result else 0
     
+    def get_daily_aggregates(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> List[Tuple[str, int, float]]:
+        """
+        Agrège les ventes complétées par jour sur une période.
+        
+        Args:
+            start_date: Date de début
+            end_date: Date de fin
+            
+        Returns:
+            list: Tuples (jour ISO, nombre de ventes, total) triés par jour
+        """
+        query = """
+            SELECT DATE(sale_date) AS day, COUNT(*) AS count,
+                   COALESCE(SUM(total), 0) AS total
+            FROM sales
+            WHERE DATE(sale_date) BETWEEN ? AND ? AND status = 'completed'
+            GROUP BY DATE(sale_date)
+            ORDER BY day
+        """
+        _, rows = self.db.fetch_rows(
+            query, (start_date.isoformat(), end_date.isoformat())
+        )
+        return rows
+    
     def get_top_products(
         self, 
         start_date: date, 
@@ -290,21 +348,31 @@ class SaleRepository(BaseRepository[Sale]):
         Returns:
             List[dict]: Produits avec quantités et totaux
         """
-        query = """
-            SELECT 
-                m.id, m.code, m.name,
-                SUM(sl.quantity) AS total_quantity,
-                SUM(sl.line_total) AS total_revenue
-            FROM sale_lines sl
-            INNER JOIN sales s ON sl.sale_id = s.id
-            INNER JOIN medicaments m ON sl.medicament_id = m.id
-            WHERE DATE(s.sale_date) BETWEEN ? AND ?
-                AND s.status = 'completed'
-            GROUP BY m.id, m.code, m.name
-            ORDER BY total_quantity DESC
-            LIMIT ?
+        return [
+            dict(zip(_TOP_PRODUCTS_COLUMNS, row))
+            for row in self.iter_top_products(start_date, end_date, limit)
+        ]
+    
+    def iter_top_products(
+        self,
+        start_date: date,
+        end_date: date,
+        limit: int = 10
+    ) -> Iterator[Tuple[int, str, str, int, float]]:
         """
-        return self.db.fetch_all(query, (
+        Itère sur les produits les plus vendus sans matérialiser la liste.
+        
+        Destiné aux exports volumineux (ex: top 1000 sur une année).
+        
+        Args:
+            start_date: Date de début
+            end_date: Date de fin
+            limit: Nombre de résultats
+            
+        Yields:
+            tuple: (id, code, nom, quantité totale, chiffre d'affaires)
+        """
+        return self.db.fetch_iter(_TOP_PRODUCTS_QUERY, (
             start_date.isoformat(), 
             end_date.isoformat(), 
             limit
@@ -314,7 +382,8 @@ class SaleRepository(BaseRepository[Sale]):
         self,
         start_date: date,
         end_date: date,
-        user_id: int
+        user_id: int,
+        include_names: bool = True
     ) -> List[Sale]:
         """
         Récupère les ventes sur une période pour un utilisateur spécifique.
@@ -323,29 +392,21 @@ class SaleRepository(BaseRepository[Sale]):
             start_date: Date de début
             end_date: Date de fin
             user_id: ID de l'utilisateur
+            include_names: Inclure les noms du client et du vendeur
             
         Returns:
             List[Sale]: Liste des ventes
         """
-        query = """
-            SELECT 
-                s.*,
-                c.first_name || ' ' || c.last_name AS client_name,
-                u.full_name AS seller_name
-            FROM sales s
-            LEFT JOIN clients c ON s.client_id = c.id
-            LEFT JOIN users u ON s.user_id = u.id
+        query = f"""
+            SELECT s.* FROM {self._sales_source(include_names)}
             WHERE DATE(s.sale_date) >= DATE(?)
             AND DATE(s.sale_date) <= DATE(?)
             AND s.user_id = ?
             ORDER BY s.sale_date DESC
         """
         
-        # CORRECTION: utiliser self.db.fetch_all et non self._fetch_all
-        results = self.db.fetch_all(query, (
+        return self._fetch_sales(query, (
             start_date.isoformat(),
             end_date.isoformat(),
             user_id
-        ))
-        
-        return [Sale.from_dict(row) for row in results]
\ No newline at end of file
+        ))
\ No newline at end of file
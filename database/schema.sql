@@ -23,7 +23,7 @@ CREATE TABLE IF NOT EXISTS users (
 );
 
 -- Index pour recherche par username
-CREATE INDEX IF NOT EXISTS idx_users_username ON users(username);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_users_username ON users(username);
 CREATE INDEX IF NOT EXISTS idx_users_role ON users(role);
 
 -- ============================================
@@ -166,6 +166,7 @@ CREATE TABLE IF NOT EXISTS stock_movements (
 
 -- Index pour historique
 CREATE INDEX IF NOT EXISTS idx_stock_movements_medicament ON stock_movements(medicament_id);
+CREATE INDEX IF NOT EXISTS idx_stock_movements_medicament_date ON stock_movements(medicament_id, created_at DESC);
 CREATE INDEX IF NOT EXISTS idx_stock_movements_date ON stock_movements(created_at);
 CREATE INDEX IF NOT EXISTS idx_stock_movements_type ON stock_movements(movement_type);
 
@@ -264,6 +265,10 @@ INNER JOIN users u ON s.user_id = u.id
 WHERE DATE(s.sale_date) = DATE('now')
 ORDER BY s.sale_date DESC;
 
+-- Vue: Ventes avec noms du client et du vendeur
+-- (v_sales_with_names, créée au démarrage par DatabaseManager:
+-- voir SALES_WITH_NAMES_VIEW dans database_manager.py)
+
 -- Vue: Palier fidélité des clients
 CREATE VIEW IF NOT EXISTS view_client_loyalty AS
 SELECT 
@@ -5,10 +5,11 @@ Auteur: Alsény Camara
 Version: 1.0
 """
 
-from typing import Optional, List
-from datetime import date
+from typing import Optional, List, Tuple
+from datetime import date, timedelta
 from database.base_repository import BaseRepository
 from models.stock_movement import StockMovement
+from models.dataclass_options import trusted_load
 
 
 class StockMovementRepository(BaseRepository[StockMovement]):
@@ -33,10 +34,30 @@ class StockMovementRepository(BaseRepository[StockMovement]):
             movement.reason
         )
         
-        self.db.execute(query, params)
-        movement.id = self.db.get_last_insert_id()
+        cursor = self.db.execute(query, params)
+        movement.id = cursor.lastrowid
         return movement
     
+    def create_many(self, movements: List[StockMovement]) -> None:
+        """Crée plusieurs mouvements de stock en une seule requête."""
+        query = """
+            INSERT INTO stock_movements (
+                medicament_id, user_id, movement_type, 
+                quantity, reference_id, reason
+            ) VALUES (?, ?, ?, ?, ?, ?)
+        """
+        self.db.execute_many(query, [
+            (
+                movement.medicament_id,
+                movement.user_id,
+                movement.movement_type,
+                movement.quantity,
+                movement.reference_id,
+                movement.reason
+            )
+            for movement in movements
+        ])
+    
     def get_by_id(self, movement_id: int) -> Optional[StockMovement]:
         """Récupère un mouvement par son ID."""
         query = """
@@ -63,20 +84,106 @@ class StockMovementRepository(BaseRepository[StockMovement]):
             ORDER BY sm.created_at DESC
         """
         results = self.db.fetch_all(query)
-        return [StockMovement.from_dict(row) for row in results]
+        with trusted_load():
+            return [StockMovement.from_dict(row) for row in results]
     
-    def get_by_medicament(self, medicament_id: int) -> List[StockMovement]:
-        """Récupère les mouvements d'un médicament."""
-        query = """
+    def _medicament_filter(
+        self,
+        medicament_id: int,
+        start_date: Optional[date],
+        end_date: Optional[date]
+    ) -> Tuple[str, Tuple]:
+        """
+        Construit la condition WHERE sur un médicament.
+        
+        La période n'est appliquée que si les deux bornes sont fournies.
+        La condition porte directement sur created_at pour que l'index
+        (medicament_id, created_at) soit utilisé.
+        
+        Returns:
+            Tuple[str, Tuple]: (condition SQL, paramètres)
+        """
+        if start_date and end_date:
+            return (
+                "sm.medicament_id = ? AND sm.created_at >= ? AND sm.created_at < ?",
+                (medicament_id, *self._date_bounds(start_date, end_date))
+            )
+        return "sm.medicament_id = ?", (medicament_id,)
+    
+    @staticmethod
+    def _date_bounds(start_date: date, end_date: date) -> Tuple[str, str]:
+        """
+        Convertit une période inclusive en bornes [début, lendemain de la fin).
+        
+        Équivaut à DATE(created_at) BETWEEN début AND fin, sans appliquer
+        de fonction à la colonne (ce qui empêcherait l'usage des index).
+        
+        Returns:
+            Tuple[str, str]: (borne inférieure incluse, borne supérieure exclue)
+        """
+        return start_date.isoformat(), (end_date + timedelta(days=1)).isoformat()
+    
+    def get_by_medicament(
+        self,
+        medicament_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> List[StockMovement]:
+        """
+        Récupère les mouvements d'un médicament.
+        
+        Args:
+            medicament_id: ID du médicament
+            start_date: Date de début (optionnel)
+            end_date: Date de fin (optionnel)
+        """
+        condition, params = self._medicament_filter(medicament_id, start_date, end_date)
+        query = f"""
             SELECT sm.*, m.name AS medicament_name, u.full_name AS user_name
             FROM stock_movements sm
             INNER JOIN medicaments m ON sm.medicament_id = m.id
             INNER JOIN users u ON sm.user_id = u.id
-            WHERE sm.medicament_id = ?
+            WHERE {condition}
             ORDER BY sm.created_at DESC
         """
-        results = self.db.fetch_all(query, (medicament_id,))
-        return [StockMovement.from_dict(row) for row in results]
+        results = self.db.fetch_all(query, params)
+        with trusted_load():
+            return [StockMovement.from_dict(row) for row in results]
+    
+    def get_totals_by_medicament(
+        self,
+        medicament_id: int,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None
+    ) -> Tuple[int, int, int]:
+        """
+        Calcule les totaux des mouvements d'un médicament.
+        
+        Args:
+            medicament_id: ID du médicament
+            start_date: Date de début (optionnel)
+            end_date: Date de fin (optionnel)
+            
+        Returns:
+            Tuple[int, int, int]: (total entrées, total sorties, nombre de mouvements)
+        """
+        condition, params = self._medicament_filter(medicament_id, start_date, end_date)
+        query = f"""
+            SELECT
+                COALESCE(SUM(CASE WHEN sm.movement_type = 'entry' THEN sm.quantity ELSE 0 END), 0) AS total_entries,
+                COALESCE(SUM(CASE WHEN sm.movement_type = 'exit' THEN ABS(sm.quantity) ELSE 0 END), 0) AS total_exits,
+                COUNT(*) AS movements_count
+            FROM stock_movements sm
+            INNER JOIN medicaments m ON sm.medicament_id = m.id
+            INNER JOIN users u ON sm.user_id = u.id
+            WHERE {condition}
+        """
+        result = self.db.fetch_one(query, params)
+        
+        if result is None:
+            return 0, 0, 0
+        
+        return result['total_entries'], result['total_exits'], result['movements_count']
     
     def get_by_date_range(
         self, 
@@ -89,14 +196,12 @@ class StockMovementRepository(BaseRepository[StockMovement]):
             FROM stock_movements sm
             INNER JOIN medicaments m ON sm.medicament_id = m.id
             INNER JOIN users u ON sm.user_id = u.id
-            WHERE DATE(sm.created_at) BETWEEN ? AND ?
+            WHERE sm.created_at >= ? AND sm.created_at < ?
             ORDER BY sm.created_at DESC
         """
-        results = self.db.fetch_all(query, (
-            start_date.isoformat(), 
-            end_date.isoformat()
-        ))
-        return [StockMovement.from_dict(row) for row in results]
+        results = self.db.fetch_all(query, self._date_bounds(start_date, end_date))
+        with trusted_load():
+            return [StockMovement.from_dict(row) for row in results]
     
     def update(self, movement: StockMovement) -> bool:
         """Les mouvements de stock ne sont pas modifiables."""
@@ -5,9 +5,13 @@ Auteur: Alsény Camara
 Version: 1.0
 """
 
-from typing import Optional, List
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, List, Dict, Any
 from database.base_repository import BaseRepository
 from models.user import User
+from models.dataclass_options import trusted_load
 
 
 class UserRepository(BaseRepository[User]):
@@ -15,8 +19,69 @@ class UserRepository(BaseRepository[User]):
     Repository pour les opérations CRUD sur les utilisateurs.
     
     Gère l'accès aux données de la table 'users'.
+    
+    Les lectures par ID et par nom d'utilisateur passent par un cache LRU
+    partagé entre les instances (taille bornée, durée de vie limitée),
+    invalidé à chaque modification.
     """
     
+    # Paramètres du cache
+    CACHE_MAX_SIZE = 256
+    CACHE_TTL_SECONDS = 60
+    
+    # Cache partagé: user_id -> (expiration, ligne), et username -> user_id
+    _cache: "OrderedDict[int, tuple]" = OrderedDict()
+    _username_index: Dict[str, int] = {}
+    _cache_lock = threading.Lock()
+    
+    def _cache_get(self, user_id: Optional[int]) -> Optional[Dict[str, Any]]:
+        """Retourne la ligne en cache pour un ID, ou None si absente/expirée."""
+        if user_id is None:
+            return None
+        
+        with self._cache_lock:
+            entry = self._cache.get(user_id)
+            if entry is None:
+                return None
+            
+            expires_at, row = entry
+            if expires_at < time.monotonic():
+                self._cache_discard(user_id)
+                return None
+            
+            self._cache.move_to_end(user_id)
+            return row
+    
+    def _cache_put(self, row: Dict[str, Any]) -> None:
+        """Ajoute une ligne utilisateur au cache."""
+        with self._cache_lock:
+            user_id = row['id']
+            self._cache_discard(user_id)
+            self._cache[user_id] = (time.monotonic() + self.CACHE_TTL_SECONDS, row)
+            self._username_index[row['username']] = user_id
+            
+            while len(self._cache) > self.CACHE_MAX_SIZE:
+                oldest_id = next(iter(self._cache))
+                self._cache_discard(oldest_id)
+    
+    def _cache_discard(self, user_id: int) -> None:
+        """Retire un utilisateur du cache (verrou déjà acquis)."""
+        entry = self._cache.pop(user_id, None)
+        if entry is not None:
+            self._username_index.pop(entry[1]['username'], None)
+    
+    def _invalidate(self, user_id: Optional[int]) -> None:
+        """Invalide l'entrée de cache d'un utilisateur."""
+        with self._cache_lock:
+            self._cache_discard(user_id)
+    
+    @classmethod
+    def clear_cache(cls) -> None:
+        """Vide le cache des utilisateurs."""
+        with cls._cache_lock:
+            cls._cache.clear()
+            cls._username_index.clear()
+    
     def create(self, user: User) -> User:
         """
         Crée un nouvel utilisateur.
@@ -39,8 +104,8 @@ class UserRepository(BaseRepository[User]):
             1 if user.is_active else 0
         )
         
-        self.db.execute(query, params)
-        user.id = self.db.get_last_insert_id()
+        cursor = self.db.execute(query, params)
+        user.id = cursor.lastrowid
         return user
     
     def get_by_id(self, user_id: int) -> Optional[User]:
@@ -53,11 +118,16 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Optional[User]: Utilisateur trouvé ou None
         """
-        query = "SELECT * FROM users WHERE id = ?"
-        result = self.db.fetch_one(query, (user_id,))
+        result = self._cache_get(user_id)
         
         if result is None:
-            return None
+            query = "SELECT * FROM users WHERE id = ?"
+            result = self.db.fetch_one(query, (user_id,))
+            
+            if result is None:
+                return None
+            
+            self._cache_put(result)
         
         return User.from_dict(result)
     
@@ -71,11 +141,16 @@ class UserRepository(BaseRepository[User]):
         Returns:
             Optional[User]: Utilisateur trouvé ou None
         """
-        query = "SELECT * FROM users WHERE username = ?"
-        result = self.db.fetch_one(query, (username,))
+        result = self._cache_get(self._username_index.get(username))
         
         if result is None:
-            return None
+            query = "SELECT * FROM users WHERE username = ?"
+            result = self.db.fetch_one(query, (username,))
+            
+            if result is None:
+                return None
+            
+            self._cache_put(result)
         
         return User.from_dict(result)
     
@@ -87,8 +162,9 @@ class UserRepository(BaseRepository[User]):
             List[User]: Liste des utilisateurs
         """
         query = "SELECT * FROM users WHERE is_active = 1 ORDER BY full_name"
-        results = self.db.fetch_all(query)
-        return [User.from_dict(row) for row in results]
+        columns, rows = self.db.fetch_rows(query)
+        with trusted_load():
+            return [User.from_row(row, columns) for row in rows]
     
     def get_all_including_inactive(self) -> List[User]:
         """
@@ -98,8 +174,9 @@ class UserRepository(BaseRepository[User]):
             List[User]: Liste de tous les utilisateurs
         """
         query = "SELECT * FROM users ORDER BY is_active DESC, full_name"
-        results = self.db.fetch_all(query)
-        return [User.from_dict(row) for row in results]
+        columns, rows = self.db.fetch_rows(query)
+        with trusted_load():
+            return [User.from_row(row, columns) for row in rows]
     
     def get_by_role(self, role: str) -> List[User]:
         """
@@ -112,8 +189,9 @@ class UserRepository(BaseRepository[User]):
             List[User]: Liste des utilisateurs du rôle
         """
         query = "SELECT * FROM users WHERE role = ? AND is_active = 1 ORDER BY full_name"
-        results = self.db.fetch_all(query, (role,))
-        return [User.from_dict(row) for row in results]
+        columns, rows = self.db.fetch_rows(query, (role,))
+        with trusted_load():
+            return [User.from_row(row, columns) for row in rows]
     
     def update(self, user: User) -> bool:
         """
@@ -141,6 +219,7 @@ class UserRepository(BaseRepository[User]):
         )
         
         cursor = self.db.execute(query, params)
+        self._invalidate(user.id)
         return cursor.rowcount > 0
     
     def update_password(self, user_id: int, password_hash: str) -> bool:
@@ -156,6 +235,7 @@ class UserRepository(BaseRepository[User]):
         """
         query = "UPDATE users SET password_hash = ? WHERE id = ?"
         cursor = self.db.execute(query, (password_hash, user_id))
+        self._invalidate(user_id)
         return cursor.rowcount > 0
     
     def delete(self, user_id: int) -> bool:
@@ -170,6 +250,7 @@ class UserRepository(BaseRepository[User]):
         """
         query = "UPDATE users SET is_active = 0 WHERE id = ?"
         cursor = self.db.execute(query, (user_id,))
+        self._invalidate(user_id)
         return cursor.rowcount > 0
     
     def username_exists(self, username: str, exclude_id: Optional[int] = None) -> bool:
@@ -184,10 +265,10 @@ class UserRepository(BaseRepository[User]):
             bool: True si existe déjà
         """
         if exclude_id:
-            query = "SELECT id FROM users WHERE username = ? AND id != ?"
+            query = "SELECT 1 FROM users WHERE username = ? AND id != ? LIMIT 1"
             result = self.db.fetch_one(query, (username, exclude_id))
         else:
-            query = "SELECT id FROM users WHERE username = ?"
+            query = "SELECT 1 FROM users WHERE username = ? LIMIT 1"
             result = self.db.fetch_one(query, (username,))
         
         return result is not None
@@ -1,88 +1,529 @@
 """
 Générateur du Guide Utilisateur PDF.
 
+Dépendances: reportlab, et de préférence son extension C
+(pip install rl_accel) qui accélère la mise en page.
+
 Auteur: Alsény Camara
 Version: 1.0
 """
 
+import io
 import os
-from datetime import datetime
-
-try:
-    from reportlab.lib.pagesizes import A4
-    from reportlab.lib.units import cm, mm
-    from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-    from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
-    from reportlab.lib import colors
-    from reportlab.platypus import (
-        SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle,
-        PageBreak, Image, ListFlowable, ListItem
-    )
-    from reportlab.pdfgen import canvas
-    REPORTLAB_AVAILABLE = True
-except ImportError:
-    REPORTLAB_AVAILABLE = False
-    print("Installez reportlab: pip install reportlab")
+import hashlib
+import shutil
+from datetime import date, datetime
+from xml.sax.saxutils import escape
+
+# ReportLab est importé à la première génération (voir _load_reportlab)
+_reportlab_loaded = False
+
+
+
+
+# Entrées de la table des matières (titre, page)
+_TOC_ITEMS = (
+    ("1. Introduction", "3"),
+    ("   1.1 Présentation de l'application", "3"),
+    ("   1.2 Configuration requise", "3"),
+    ("   1.3 Rôles utilisateurs", "4"),
+    ("2. Connexion et Authentification", "5"),
+    ("   2.1 Écran de connexion", "5"),
+    ("   2.2 Gestion du mot de passe", "5"),
+    ("3. Tableau de Bord", "6"),
+    ("   3.1 Vue d'ensemble", "6"),
+    ("   3.2 Indicateurs clés", "6"),
+    ("   3.3 Alertes", "7"),
+    ("4. Gestion des Médicaments", "8"),
+    ("   4.1 Liste des médicaments", "8"),
+    ("   4.2 Ajouter un médicament", "9"),
+    ("   4.3 Modifier un médicament", "10"),
+    ("   4.4 Gestion du stock", "11"),
+    ("5. Point de Vente (POS)", "12"),
+    ("   5.1 Interface de vente", "12"),
+    ("   5.2 Processus de vente", "13"),
+    ("   5.3 Gestion du panier", "14"),
+    ("   5.4 Validation et ticket", "15"),
+    ("6. Gestion des Clients", "16"),
+    ("   6.1 Fichier clients", "16"),
+    ("   6.2 Programme de fidélité", "17"),
+    ("7. Rapports et Statistiques", "18"),
+    ("   7.1 Ventes par vendeur", "18"),
+    ("   7.2 État du stock", "19"),
+    ("   7.3 Top produits", "20"),
+    ("   7.4 Export des données", "20"),
+    ("8. Administration", "21"),
+    ("   8.1 Gestion des utilisateurs", "21"),
+    ("   8.2 Paramètres", "22"),
+    ("9. FAQ et Dépannage", "23"),
+)
+
+# Chapitre 1: configuration requise
+_CONFIG_DATA = (
+    ('Composant', 'Minimum', 'Recommandé'),
+    ('Système d\'exploitation', 'Windows 10', 'Windows 11'),
+    ('Processeur', 'Intel Core i3', 'Intel Core i5'),
+    ('Mémoire RAM', '4 Go', '8 Go'),
+    ('Espace disque', '500 Mo', '1 Go'),
+    ('Écran', '1366x768', '1920x1080')
+)
+
+# Chapitre 1: rôles utilisateurs
+_ROLES_DATA = (
+    ('Rôle', 'Description', 'Permissions'),
+    ('Administrateur', 'Gestionnaire principal', 'Accès complet à tous les modules'),
+    ('Pharmacien', 'Professionnel de santé', 'Médicaments, ventes, clients, rapports'),
+    ('Vendeur', 'Personnel de comptoir', 'Ventes uniquement')
+)
+
+# Chapitre 3: indicateurs clés
+_KPI_DATA = (
+    ('Indicateur', 'Description'),
+    ('Chiffre d\'affaires du jour', 'Total des ventes validées aujourd\'hui'),
+    ('Nombre de ventes', 'Nombre de transactions du jour'),
+    ('Produits en stock', 'Nombre total de références en stock'),
+    ('Alertes stock faible', 'Produits sous le seuil d\'alerte'),
+    ('Alertes péremption', 'Produits expirant dans les 30 jours')
+)
+
+# Chapitre 5: étapes d'une vente
+_SALE_STEPS = (
+    "1. AJOUTER DES PRODUITS AU PANIER",
+    "   • Saisissez le code ou le nom du produit",
+    "   • Indiquez la quantité souhaitée",
+    "   • Cliquez sur '➕ Ajouter' ou appuyez sur Entrée",
+    "   • Utilisez '🔍 Rechercher' pour trouver un produit",
+    "",
+    "2. ASSOCIER UN CLIENT (optionnel)",
+    "   • Cliquez sur '🔍 Sélectionner' pour choisir un client existant",
+    "   • Ou cliquez sur '➕ Nouveau' pour créer un client rapidement",
+    "   • Le client bénéficiera de sa remise fidélité automatiquement",
+    "",
+    "3. VÉRIFIER LE PANIER",
+    "   • Vérifiez les quantités et les prix",
+    "   • Modifiez si nécessaire avec '🔄 Modifier qté'",
+    "   • Supprimez un produit avec '🗑️ Retirer'",
+    "",
+    "4. VALIDER LA VENTE",
+    "   • Vérifiez le total affiché",
+    "   • Cliquez sur '✅ VALIDER LA VENTE'",
+    "   • Confirmez la validation",
+    "",
+    "5. IMPRIMER LE TICKET",
+    "   • Après validation, choisissez d'imprimer le ticket",
+    "   • Le ticket PDF est généré et peut être imprimé"
+)
+
+# Chapitre 5: actions du panier
+_PANIER_DATA = (
+    ('Action', 'Description'),
+    ('➕ Ajouter', 'Ajoute un produit au panier'),
+    ('🔄 Modifier qté', 'Change la quantité d\'un produit'),
+    ('🗑️ Retirer', 'Supprime un produit du panier'),
+    ('🗑️ Vider panier', 'Supprime tous les produits'),
+    ('🆕 Nouvelle vente', 'Annule et recommence une nouvelle vente')
+)
+
+# Chapitre 6: paliers de fidélité
+_FIDELITY_DATA = (
+    ('Palier', 'Points requis', 'Remise'),
+    ('Standard', '0', '0%'),
+    ('Bronze', '100', '2%'),
+    ('Argent', '250', '5%'),
+    ('Or', '500', '8%'),
+    ('Platine', '1000', '10%')
+)
+
+# Chapitre 9: questions fréquentes
+_FAQS = (
+    {
+        'q': "L'application ne démarre pas",
+        'a': "Vérifiez que vous avez les droits d'exécution. "
+             "Essayez de lancer en tant qu'administrateur. "
+             "Vérifiez que l'antivirus ne bloque pas l'application."
+    },
+    {
+        'q': "J'ai oublié mon mot de passe",
+        'a': "Contactez l'administrateur qui peut réinitialiser votre mot de passe "
+             "depuis le module de gestion des utilisateurs."
+    },
+    {
+        'q': "Le ticket ne s'imprime pas",
+        'a': "Vérifiez que votre imprimante est bien configurée comme imprimante par défaut. "
+             "Le ticket est généré en PDF dans le dossier 'receipts'."
+    },
+    {
+        'q': "Comment annuler une vente ?",
+        'a': "Seuls l'administrateur et le pharmacien peuvent annuler une vente. "
+             "Accédez à l'historique des ventes et utilisez la fonction d'annulation."
+    },
+    {
+        'q': "Les données sont-elles sécurisées ?",
+        'a': "Oui, les mots de passe sont cryptés et la base de données est locale. "
+             "Effectuez des sauvegardes régulières pour éviter toute perte."
+    },
+    {
+        'q': "Comment mettre à jour l'application ?",
+        'a': "Faites une sauvegarde, fermez l'application, remplacez l'exécutable "
+             "par la nouvelle version, puis relancez."
+    }
+)
+
+# Questions et réponses déjà mises en forme, construites une fois à l'import
+_FAQ_RENDERED = tuple((f"❓ {faq['q']}", faq['a']) for faq in _FAQS)
+
+
+def _create_palette() -> None:
+    """
+    Définit les couleurs du guide, converties une seule fois en HexColor.
+    
+    Appelée une seule fois par _load_reportlab.
+    """
+    global _BLUE, _BLUE_LIGHT, _GREY, _MID_GREY, _DARK_GREY, _BG_GREY
+    global _ORANGE, _ORANGE_LIGHT, _GREEN, _GREEN_LIGHT, _YELLOW
+    
+    _BLUE = colors.HexColor('#1976D2')
+    _BLUE_LIGHT = colors.HexColor('#E3F2FD')
+    _GREY = colors.HexColor('#BDBDBD')
+    _MID_GREY = colors.HexColor('#757575')
+    _DARK_GREY = colors.HexColor('#424242')
+    _BG_GREY = colors.HexColor('#F5F5F5')
+    _ORANGE = colors.HexColor('#FF9800')
+    _ORANGE_LIGHT = colors.HexColor('#FFF3E0')
+    _GREEN = colors.HexColor('#4CAF50')
+    _GREEN_LIGHT = colors.HexColor('#E8F5E9')
+    _YELLOW = colors.HexColor('#FFC107')
+
+
+def _create_table_styles() -> None:
+    """
+    Construit les styles de tableaux partagés par les chapitres.
+    
+    Appelée une seule fois par _load_reportlab, après la définition
+    des couleurs.
+    """
+    global _HEADER_TABLE_STYLE, _ROLES_TABLE_STYLE, _CONFIG_TABLE_STYLE
+    global _FIDELITY_TABLE_STYLE, _INFO_TABLE_STYLE, _TOC_TABLE_STYLE
+    
+    # Tableau à en-tête bleu
+    _HEADER_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), _BLUE),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('PADDING', (0, 0), (-1, -1), 8),
+    ])
+    
+    # Tableau à en-tête bleu, cellules centrées verticalement
+    _ROLES_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), _BLUE),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('PADDING', (0, 0), (-1, -1), 8),
+    ])
+    
+    # Tableau à en-tête bleu, contenu centré sur fond gris
+    _CONFIG_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), _BLUE),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('PADDING', (0, 0), (-1, -1), 8),
+        ('BACKGROUND', (0, 1), (-1, -1), _BG_GREY),
+    ])
+    
+    # Tableau des paliers de fidélité
+    _FIDELITY_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), _YELLOW),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+        ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
+        ('PADDING', (0, 0), (-1, -1), 8),
+    ])
+    
+    # Tableau d'informations de la page de garde
+    _INFO_TABLE_STYLE = TableStyle([
+        ('BACKGROUND', (0, 0), (0, -1), _BLUE_LIGHT),
+        ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('GRID', (0, 0), (-1, -1), 0.5, _GREY),
+        ('PADDING', (0, 0), (-1, -1), 10),
+    ])
+    
+    # Table des matières
+    _TOC_TABLE_STYLE = TableStyle([
+        ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+        ('FONTSIZE', (0, 0), (-1, -1), 10),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
+    ])
+
+
+class _ChapterFlowables(list):
+    """
+    Liste d'éléments alimentée chapitre par chapitre, consommée par build().
+    
+    Le chapitre suivant n'est chargé que lorsque la liste est presque vide
+    ou que son dernier élément doit rester avec le suivant (keepWithNext):
+    au plus deux chapitres sont en mémoire pendant la mise en page.
+    """
+    
+    def __init__(self, chapters):
+        """
+        Args:
+            chapters: Itérable des éléments de chaque chapitre, dans
+                      l'ordre; un saut de page sépare les chapitres
+        """
+        super().__init__()
+        self._chapters = iter(chapters)
+        self._loaded = 0
+    
+    def _fill(self) -> None:
+        """Charge les chapitres suivants tant que la mise en page en a besoin."""
+        while self._chapters is not None and (
+            list.__len__(self) < 2
+            or list.__getitem__(self, -1).getKeepWithNext()
+        ):
+            try:
+                flowables = next(self._chapters)
+            except StopIteration:
+                self._chapters = None
+                return
+            if self._loaded:
+                self.append(_PAGE_BREAK)
+            self.extend(flowables)
+            self._loaded += 1
+    
+    def __len__(self) -> int:
+        self._fill()
+        return list.__len__(self)
+    
+    def __getitem__(self, index):
+        self._fill()
+        return list.__getitem__(self, index)
+
+
+def _define_doc_template() -> type:
+    """
+    Définit le gabarit de document du guide.
+    
+    Appelée une seule fois par _load_reportlab, la classe dérivant
+    de BaseDocTemplate.
+    
+    Returns:
+        type: Classe GuideDocTemplate
+    """
+    class GuideDocTemplate(BaseDocTemplate):
+        """
+        Gabarit A4 à modèle de page unique, alimenté chapitre par chapitre.
+        
+        Les chapitres sont transmis à build() au fur et à mesure de la
+        mise en page, via _ChapterFlowables.
+        """
+        
+        def __init__(self, filename, **kwargs):
+            super().__init__(filename, **kwargs)
+            frame = Frame(
+                self.leftMargin, self.bottomMargin,
+                self.width, self.height,
+                id='normal'
+            )
+            self.addPageTemplates([
+                PageTemplate(id='Page', frames=frame, pagesize=self.pagesize)
+            ])
+        
+        def build_chapters(self, chapters) -> None:
+            """
+            Construit le document chapitre par chapitre.
+            
+            Args:
+                chapters: Itérable des éléments de chaque chapitre, dans
+                          l'ordre; un saut de page sépare les chapitres
+            """
+            self.build(_ChapterFlowables(chapters))
+        
+        def afterFlowable(self, flowable) -> None:
+            """
+            Efface la marque de report posée par ReportLab sur un élément
+            dessiné, les éléments partagés étant réutilisés plus loin.
+            """
+            flowable.__dict__.pop('_postponed', None)
+    
+    return GuideDocTemplate
+
+
+def _load_reportlab() -> bool:
+    """
+    Importe ReportLab à la demande et définit ses symboles au niveau
+    du module (déclarations global ci-dessous).
+    
+    Importer ce module reste ainsi quasi gratuit tant que le guide
+    n'est pas généré.
+    
+    Returns:
+        bool: True si ReportLab est disponible
+    """
+    global _reportlab_loaded
+    global A4, cm, mm, StyleSheet1, ParagraphStyle
+    global TA_CENTER, TA_LEFT, TA_JUSTIFY, colors, canvas
+    global BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, Table
+    global TableStyle, PageBreak, Image, ListFlowable, ListItem
+    global _PAGE_BREAK, _SPACE_03, _SPACE_1, GuideDocTemplate
+    if _reportlab_loaded:
+        return True
+    
+    try:
+        from reportlab.lib.pagesizes import A4
+        from reportlab.lib.units import cm, mm
+        from reportlab.lib.styles import StyleSheet1, ParagraphStyle
+        from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
+        from reportlab.lib import colors
+        from reportlab.platypus import (
+            BaseDocTemplate, PageTemplate, Frame, Paragraph, Spacer, Table,
+            TableStyle, PageBreak, Image, ListFlowable, ListItem
+        )
+        from reportlab.pdfgen import canvas
+    except ImportError:
+        print("Installez reportlab: pip install reportlab")
+        return False
+    
+    # Extension C utilisée par ReportLab pour la mise en page (facultative)
+    try:
+        import _rl_accel  # noqa: F401
+    except ImportError:
+        print("Avertissement: _rl_accel indisponible, génération PDF plus lente "
+              "(pip install rl_accel)")
+    
+    _create_palette()
+    _create_table_styles()
+    
+    # Éléments sans état, partagés par tous les chapitres
+    _PAGE_BREAK = PageBreak()
+    _SPACE_03 = Spacer(1, 0.3*cm)
+    _SPACE_1 = Spacer(1, 1*cm)
+    
+    GuideDocTemplate = _define_doc_template()
+    _reportlab_loaded = True
+    return True
+
+
+# Version du contenu du guide (à incrémenter en cas de changement de mise en page)
+GUIDE_VERSION = "1.0"
+
+# Dossier de cache des guides déjà générés
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "pharmacie_manager")
 
 
 class GuideUtilisateurGenerator:
     """Génère le guide utilisateur en PDF."""
     
+    # Feuille de styles partagée (construite à la première génération)
+    _STYLES = None
+    
     def __init__(self, output_path: str = "Guide_Utilisateur_PharmacieManager.pdf"):
         self.output_path = output_path
-        self.styles = getSampleStyleSheet()
-        self._setup_styles()
+        self.styles = None
     
-    def _setup_styles(self):
-        """Configure les styles personnalisés."""
+    @classmethod
+    def _get_styles(cls):
+        """
+        Retourne la feuille de styles partagée par toutes les instances.
+        
+        Les styles sont constants: ils sont construits au premier appel
+        puis réutilisés.
+        """
+        if cls._STYLES is not None:
+            return cls._STYLES
+        
+        # Seuls les styles de base utilisés comme parents sont définis
+        styles = StyleSheet1()
+        styles.add(ParagraphStyle(
+            name='Normal',
+            fontName='Helvetica',
+            fontSize=10,
+            leading=12
+        ))
+        styles.add(ParagraphStyle(
+            name='Heading1',
+            parent=styles['Normal'],
+            fontName='Helvetica-Bold',
+            fontSize=18,
+            leading=22,
+            spaceAfter=6
+        ))
+        styles.add(ParagraphStyle(
+            name='Heading2',
+            parent=styles['Normal'],
+            fontName='Helvetica-Bold',
+            fontSize=14,
+            leading=18,
+            spaceBefore=12,
+            spaceAfter=6
+        ))
+        styles.add(ParagraphStyle(
+            name='Heading3',
+            parent=styles['Normal'],
+            fontName='Helvetica-BoldOblique',
+            fontSize=12,
+            leading=14,
+            spaceBefore=12,
+            spaceAfter=6
+        ))
+        
         # Titre principal
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='MainTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=24,
             alignment=TA_CENTER,
             spaceAfter=30,
-            textColor=colors.HexColor('#1976D2')
+            textColor=_BLUE
         ))
         
         # Titre de chapitre
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ChapterTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=18,
             spaceBefore=20,
             spaceAfter=15,
-            textColor=colors.HexColor('#1976D2'),
+            textColor=_BLUE,
             borderWidth=1,
-            borderColor=colors.HexColor('#1976D2'),
+            borderColor=_BLUE,
             borderPadding=10,
-            backColor=colors.HexColor('#E3F2FD')
+            backColor=_BLUE_LIGHT
         ))
         
         # Titre de section
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SectionTitle',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=14,
-            spaceBefore=15,
+            spaceBefore=30,  # Inclut l'espacement entre sections
             spaceAfter=10,
-            textColor=colors.HexColor('#1976D2')
+            textColor=_BLUE
         ))
         
         # Sous-titre
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='SubTitle',
-            parent=self.styles['Heading3'],
+            parent=styles['Heading3'],
             fontSize=12,
             spaceBefore=10,
             spaceAfter=8,
-            textColor=colors.HexColor('#424242')
+            textColor=_DARK_GREY
         ))
         
         # Texte normal
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='NormalText',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=10,
             alignment=TA_JUSTIFY,
             spaceAfter=8,
@@ -90,37 +531,97 @@ class GuideUtilisateurGenerator:
         ))
         
         # Note importante
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='ImportantNote',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=10,
-            backColor=colors.HexColor('#FFF3E0'),
+            backColor=_ORANGE_LIGHT,
             borderWidth=1,
-            borderColor=colors.HexColor('#FF9800'),
+            borderColor=_ORANGE,
             borderPadding=10,
             spaceAfter=10
         ))
         
         # Astuce
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='Tip',
-            parent=self.styles['Normal'],
+            parent=styles['Normal'],
             fontSize=10,
-            backColor=colors.HexColor('#E8F5E9'),
+            backColor=_GREEN_LIGHT,
             borderWidth=1,
-            borderColor=colors.HexColor('#4CAF50'),
+            borderColor=_GREEN,
             borderPadding=10,
             spaceAfter=10
         ))
+        
+        cls._STYLES = styles
+        return styles
+    
+    def _content_hash(self) -> str:
+        """
+        Calcule l'empreinte du contenu du guide.
+        
+        Le contenu étant défini dans ce module, l'empreinte porte sur son
+        code source, la version du guide et la date du jour (page de garde).
+        
+        Returns:
+            str: Empreinte SHA-256 hexadécimale
+        """
+        digest = hashlib.sha256()
+        with open(__file__, 'rb') as source:
+            digest.update(source.read())
+        digest.update(GUIDE_VERSION.encode('utf-8'))
+        digest.update(datetime.now().strftime('%d/%m/%Y').encode('utf-8'))
+        return digest.hexdigest()
     
-    def generate(self):
-        """Génère le document PDF complet."""
-        if not REPORTLAB_AVAILABLE:
+    def _is_up_to_date(self) -> bool:
+        """
+        Indique si le guide existant est plus récent que ce module.
+        
+        Le guide doit aussi dater du jour, la date figurant sur la page
+        de garde.
+        
+        Returns:
+            bool: True si le guide peut être conservé tel quel
+        """
+        try:
+            output_mtime = os.path.getmtime(self.output_path)
+            source_mtime = os.path.getmtime(__file__)
+        except OSError:
+            return False
+        
+        generated_today = datetime.fromtimestamp(output_mtime).date() == date.today()
+        return output_mtime >= source_mtime and generated_today
+    
+    def generate(self, force: bool = False):
+        """
+        Génère le document PDF complet.
+        
+        Args:
+            force: Régénérer même si le guide est à jour ou en cache
+        """
+        if not force and self._is_up_to_date():
+            print(f"Guide à jour : {self.output_path}")
+            return
+        
+        # Réutiliser le guide en cache si le contenu n'a pas changé
+        cached_path = os.path.join(CACHE_DIR, f"guide_{self._content_hash()}.pdf")
+        if not force and os.path.exists(cached_path):
+            shutil.copyfile(cached_path, self.output_path)
+            print(f"Guide généré (cache) : {self.output_path}")
+            return
+        
+        if not _load_reportlab():
             print("ReportLab non disponible")
             return
         
-        doc = SimpleDocTemplate(
-            self.output_path,
+        # Styles construits après l'import de ReportLab
+        self.styles = type(self)._get_styles()
+        
+        # Le PDF est produit en mémoire puis écrit en une seule fois
+        buffer = io.BytesIO()
+        doc = GuideDocTemplate(
+            buffer,
             pagesize=A4,
             rightMargin=2*cm,
             leftMargin=2*cm,
@@ -128,87 +629,117 @@ class GuideUtilisateurGenerator:
             bottomMargin=2*cm
         )
         
-        elements = []
-        
-        # Page de garde
-        elements.extend(self._create_cover_page())
-        elements.append(PageBreak())
-        
-        # Table des matières
-        elements.extend(self._create_table_of_contents())
-        elements.append(PageBreak())
-        
-        # Chapitre 1: Introduction
-        elements.extend(self._create_chapter_introduction())
-        elements.append(PageBreak())
-        
-        # Chapitre 2: Connexion
-        elements.extend(self._create_chapter_connexion())
-        elements.append(PageBreak())
+        builders = (
+            self._create_cover_page,            # Page de garde
+            self._create_table_of_contents,     # Table des matières
+            self._create_chapter_introduction,  # Chapitre 1: Introduction
+            self._create_chapter_connexion,     # Chapitre 2: Connexion
+            self._create_chapter_dashboard,     # Chapitre 3: Tableau de bord
+            self._create_chapter_medicaments,   # Chapitre 4: Gestion des médicaments
+            self._create_chapter_pos,           # Chapitre 5: Point de vente
+            self._create_chapter_clients,       # Chapitre 6: Gestion des clients
+            self._create_chapter_reports,       # Chapitre 7: Rapports
+            self._create_chapter_admin,         # Chapitre 8: Administration
+            self._create_chapter_faq            # Chapitre 9: FAQ
+        )
         
-        # Chapitre 3: Tableau de bord
-        elements.extend(self._create_chapter_dashboard())
-        elements.append(PageBreak())
+        doc.build_chapters(build() for build in builders)
         
-        # Chapitre 4: Gestion des médicaments
-        elements.extend(self._create_chapter_medicaments())
-        elements.append(PageBreak())
+        with open(self.output_path, 'wb') as output:
+            output.write(buffer.getbuffer())
         
-        # Chapitre 5: Point de vente
-        elements.extend(self._create_chapter_pos())
-        elements.append(PageBreak())
+        # Mettre en cache le guide généré
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        temp_path = f"{cached_path}.tmp"
+        with open(temp_path, 'wb') as cached:
+            cached.write(buffer.getbuffer())
+        os.replace(temp_path, cached_path)
+        self._prune_cache(cached_path)
         
-        # Chapitre 6: Gestion des clients
-        elements.extend(self._create_chapter_clients())
-        elements.append(PageBreak())
+        print(f"Guide généré : {self.output_path}")
+    
+    @staticmethod
+    def _prune_cache(current_path: str) -> None:
+        """
+        Supprime les guides en cache périmés (autre jour ou autre version).
+        
+        Args:
+            current_path: Guide en cache à conserver
+        """
+        for name in os.listdir(CACHE_DIR):
+            path = os.path.join(CACHE_DIR, name)
+            if (name.startswith("guide_") and name.endswith(".pdf")
+                    and path != current_path):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+    
+    @staticmethod
+    def _row_heights(data) -> list:
+        """
+        Calcule les hauteurs de lignes d'un tableau à en-tête.
         
-        # Chapitre 7: Rapports
-        elements.extend(self._create_chapter_reports())
-        elements.append(PageBreak())
+        Fournir les hauteurs évite à ReportLab de les mesurer cellule
+        par cellule. Elles couvrent une ligne de texte et un padding de 8.
         
-        # Chapitre 8: Administration
-        elements.extend(self._create_chapter_admin())
-        elements.append(PageBreak())
+        Args:
+            data: Lignes du tableau, en-tête compris
+            
+        Returns:
+            list: Hauteur de chaque ligne
+        """
+        return [1.2*cm] + [1.0*cm] * (len(data) - 1)
+    
+    def _bullets(self, items, style=None):
+        """
+        Regroupe une liste d'éléments dans un seul paragraphe.
         
-        # Chapitre 9: FAQ
-        elements.extend(self._create_chapter_faq())
+        Les éléments sont échappés: seuls les sauts de ligne ajoutés
+        sont interprétés comme balises.
         
-        # Générer le PDF
-        doc.build(elements)
-        print(f"Guide généré : {self.output_path}")
+        Args:
+            items: Lignes à afficher (puces et numéros inclus)
+            style: Style du paragraphe (NormalText par défaut)
+            
+        Returns:
+            Paragraph: Paragraphe avec une ligne par élément
+        """
+        return Paragraph(
+            '<br/>'.join(escape(item) for item in items),
+            style or self.styles['NormalText']
+        )
     
     def _create_cover_page(self):
         """Crée la page de garde."""
-        elements = []
-        
-        elements.append(Spacer(1, 3*cm))
+        yield Spacer(1, 3*cm)
         
-        elements.append(Paragraph(
+        yield Paragraph(
             "PHARMACIE MANAGER",
             self.styles['MainTitle']
-        ))
+        )
         
-        elements.append(Spacer(1, 1*cm))
+        yield _SPACE_1
         
-        elements.append(Paragraph(
+        yield Paragraph(
             "Guide Utilisateur Complet",
             ParagraphStyle(
                 'Subtitle',
                 parent=self.styles['Heading2'],
                 fontSize=16,
                 alignment=TA_CENTER,
-                textColor=colors.HexColor('#757575')
+                textColor=_MID_GREY
             )
-        ))
+        )
         
-        elements.append(Spacer(1, 2*cm))
+        yield Spacer(1, 2*cm)
         
-        elements.append(Paragraph(
+        yield Paragraph(
             "Version 1.0",
             ParagraphStyle('Version', alignment=TA_CENTER, fontSize=12)
-        ))
+        )
         
-        elements.append(Spacer(1, 5*cm))
+        yield Spacer(1, 5*cm)
         
         # Informations
         info_data = [
@@ -219,93 +750,49 @@ class GuideUtilisateurGenerator:
             ['Date', datetime.now().strftime('%d/%m/%Y')]
         ]
         
-        info_table = Table(info_data, colWidths=[5*cm, 8*cm])
-        info_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.HexColor('#E3F2FD')),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDBDBD')),
-            ('PADDING', (0, 0), (-1, -1), 10),
-        ]))
-        elements.append(info_table)
-        
-        return elements
+        info_table = Table(
+            info_data,
+            colWidths=[5*cm, 8*cm],
+            rowHeights=[1.2*cm] * len(info_data)
+        )
+        info_table.setStyle(_INFO_TABLE_STYLE)
+        yield info_table
     
     def _create_table_of_contents(self):
         """Crée la table des matières."""
-        elements = []
-        
-        elements.append(Paragraph("TABLE DES MATIÈRES", self.styles['ChapterTitle']))
-        elements.append(Spacer(1, 1*cm))
-        
-        toc_items = [
-            ("1. Introduction", "3"),
-            ("   1.1 Présentation de l'application", "3"),
-            ("   1.2 Configuration requise", "3"),
-            ("   1.3 Rôles utilisateurs", "4"),
-            ("2. Connexion et Authentification", "5"),
-            ("   2.1 Écran de connexion", "5"),
-            ("   2.2 Gestion du mot de passe", "5"),
-            ("3. Tableau de Bord", "6"),
-            ("   3.1 Vue d'ensemble", "6"),
-            ("   3.2 Indicateurs clés", "6"),
-            ("   3.3 Alertes", "7"),
-            ("4. Gestion des Médicaments", "8"),
-            ("   4.1 Liste des médicaments", "8"),
-            ("   4.2 Ajouter un médicament", "9"),
-            ("   4.3 Modifier un médicament", "10"),
-            ("   4.4 Gestion du stock", "11"),
-            ("5. Point de Vente (POS)", "12"),
-            ("   5.1 Interface de vente", "12"),
-            ("   5.2 Processus de vente", "13"),
-            ("   5.3 Gestion du panier", "14"),
-            ("   5.4 Validation et ticket", "15"),
-            ("6. Gestion des Clients", "16"),
-            ("   6.1 Fichier clients", "16"),
-            ("   6.2 Programme de fidélité", "17"),
-            ("7. Rapports et Statistiques", "18"),
-            ("   7.1 Ventes par vendeur", "18"),
-            ("   7.2 État du stock", "19"),
-            ("   7.3 Top produits", "20"),
-            ("   7.4 Export des données", "20"),
-            ("8. Administration", "21"),
-            ("   8.1 Gestion des utilisateurs", "21"),
-            ("   8.2 Paramètres", "22"),
-            ("9. FAQ et Dépannage", "23"),
-        ]
+        chapter_title = self.styles['ChapterTitle']
         
-        for item, page in toc_items:
-            row = Table(
-                [[item, page]],
-                colWidths=[14*cm, 2*cm]
-            )
-            row.setStyle(TableStyle([
-                ('ALIGN', (0, 0), (0, 0), 'LEFT'),
-                ('ALIGN', (1, 0), (1, 0), 'RIGHT'),
-                ('FONTSIZE', (0, 0), (-1, -1), 10),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 5),
-            ]))
-            elements.append(row)
+        yield Paragraph("TABLE DES MATIÈRES", chapter_title)
+        yield _SPACE_1
         
-        return elements
+        # Une seule table pour toutes les entrées
+        toc_table = Table(
+            _TOC_ITEMS,
+            colWidths=[14*cm, 2*cm],
+            rowHeights=[0.7*cm] * len(_TOC_ITEMS)
+        )
+        toc_table.setStyle(_TOC_TABLE_STYLE)
+        yield toc_table
     
     def _create_chapter_introduction(self):
         """Chapitre 1: Introduction."""
-        elements = []
+        chapter_title = self.styles['ChapterTitle']
+        section_title = self.styles['SectionTitle']
+        subtitle = self.styles['SubTitle']
+        normal = self.styles['NormalText']
         
-        elements.append(Paragraph("1. INTRODUCTION", self.styles['ChapterTitle']))
+        yield Paragraph("1. INTRODUCTION", chapter_title)
         
         # 1.1 Présentation
-        elements.append(Paragraph("1.1 Présentation de l'application", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("1.1 Présentation de l'application", section_title)
+        yield Paragraph(
             """PharmacieManager est une application de bureau professionnelle conçue pour 
             la gestion complète d'une pharmacie. Elle permet de gérer les médicaments, 
             les ventes, les clients, le stock et de générer des rapports détaillés.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
-        elements.append(Paragraph("Fonctionnalités principales :", self.styles['SubTitle']))
+        yield Paragraph("Fonctionnalités principales :", subtitle)
         
         features = [
             "✓ Gestion complète du catalogue de médicaments",
@@ -318,84 +805,56 @@ class GuideUtilisateurGenerator:
             "✓ Fonctionne hors ligne (pas besoin d'internet)"
         ]
         
-        for feature in features:
-            elements.append(Paragraph(feature, self.styles['NormalText']))
-        
-        elements.append(Spacer(1, 0.5*cm))
+        yield self._bullets(features)
         
         # 1.2 Configuration requise
-        elements.append(Paragraph("1.2 Configuration requise", self.styles['SectionTitle']))
-        
-        config_data = [
-            ['Composant', 'Minimum', 'Recommandé'],
-            ['Système d\'exploitation', 'Windows 10', 'Windows 11'],
-            ['Processeur', 'Intel Core i3', 'Intel Core i5'],
-            ['Mémoire RAM', '4 Go', '8 Go'],
-            ['Espace disque', '500 Mo', '1 Go'],
-            ['Écran', '1366x768', '1920x1080']
-        ]
-        
-        config_table = Table(config_data, colWidths=[5*cm, 4*cm, 4*cm])
-        config_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976D2')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('PADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.HexColor('#F5F5F5')),
-        ]))
-        elements.append(config_table)
+        yield Paragraph("1.2 Configuration requise", section_title)
         
-        elements.append(Spacer(1, 0.5*cm))
+        config_table = Table(
+            _CONFIG_DATA,
+            colWidths=[5*cm, 4*cm, 4*cm],
+            rowHeights=self._row_heights(_CONFIG_DATA)
+        )
+        config_table.setStyle(_CONFIG_TABLE_STYLE)
+        yield config_table
         
         # 1.3 Rôles utilisateurs
-        elements.append(Paragraph("1.3 Rôles utilisateurs", self.styles['SectionTitle']))
-        
-        roles_data = [
-            ['Rôle', 'Description', 'Permissions'],
-            ['Administrateur', 'Gestionnaire principal', 'Accès complet à tous les modules'],
-            ['Pharmacien', 'Professionnel de santé', 'Médicaments, ventes, clients, rapports'],
-            ['Vendeur', 'Personnel de comptoir', 'Ventes uniquement']
-        ]
-        
-        roles_table = Table(roles_data, colWidths=[3*cm, 4*cm, 6*cm])
-        roles_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976D2')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
-        elements.append(roles_table)
+        yield Paragraph("1.3 Rôles utilisateurs", section_title)
         
-        return elements
+        roles_table = Table(
+            _ROLES_DATA,
+            colWidths=[3*cm, 4*cm, 6*cm],
+            rowHeights=self._row_heights(_ROLES_DATA)
+        )
+        roles_table.setStyle(_ROLES_TABLE_STYLE)
+        yield roles_table
     
     def _create_chapter_connexion(self):
         """Chapitre 2: Connexion."""
-        elements = []
+        chapter_title = self.styles['ChapterTitle']
+        section_title = self.styles['SectionTitle']
+        subtitle = self.styles['SubTitle']
+        normal = self.styles['NormalText']
         
-        elements.append(Paragraph("2. CONNEXION ET AUTHENTIFICATION", self.styles['ChapterTitle']))
+        yield Paragraph("2. CONNEXION ET AUTHENTIFICATION", chapter_title)
         
         # 2.1 Écran de connexion
-        elements.append(Paragraph("2.1 Écran de connexion", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("2.1 Écran de connexion", section_title)
+        yield Paragraph(
             """Au lancement de l'application, l'écran de connexion s'affiche. 
             Vous devez saisir votre identifiant et votre mot de passe pour accéder au système.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
-        elements.append(Paragraph(
+        yield Paragraph(
             "⚠️ IMPORTANT : Lors de la première connexion, utilisez les identifiants par défaut :\n"
             "• Identifiant : admin\n"
             "• Mot de passe : admin123\n\n"
             "Changez immédiatement ce mot de passe après la première connexion !",
             self.styles['ImportantNote']
-        ))
+        )
         
-        elements.append(Paragraph("Étapes de connexion :", self.styles['SubTitle']))
+        yield Paragraph("Étapes de connexion :", subtitle)
         steps = [
             "1. Lancez l'application PharmacieManager",
             "2. Saisissez votre identifiant dans le champ 'Nom d'utilisateur'",
@@ -403,106 +862,86 @@ class GuideUtilisateurGenerator:
             "4. Cliquez sur le bouton 'Se connecter' ou appuyez sur Entrée",
             "5. En cas d'erreur, vérifiez vos identifiants et réessayez"
         ]
-        for step in steps:
-            elements.append(Paragraph(step, self.styles['NormalText']))
-        
-        elements.append(Spacer(1, 0.5*cm))
+        yield self._bullets(steps)
         
         # 2.2 Gestion du mot de passe
-        elements.append(Paragraph("2.2 Sécurité du mot de passe", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("2.2 Sécurité du mot de passe", section_title)
+        yield Paragraph(
             "💡 ASTUCE : Choisissez un mot de passe sécurisé :\n"
             "• Au moins 8 caractères\n"
             "• Mélange de lettres majuscules et minuscules\n"
             "• Au moins un chiffre\n"
             "• Évitez les mots du dictionnaire",
             self.styles['Tip']
-        ))
-        
-        return elements
+        )
     
     def _create_chapter_dashboard(self):
         """Chapitre 3: Tableau de bord."""
-        elements = []
+        chapter_title = self.styles['ChapterTitle']
+        section_title = self.styles['SectionTitle']
+        normal = self.styles['NormalText']
         
-        elements.append(Paragraph("3. TABLEAU DE BORD", self.styles['ChapterTitle']))
+        yield Paragraph("3. TABLEAU DE BORD", chapter_title)
         
-        elements.append(Paragraph("3.1 Vue d'ensemble", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("3.1 Vue d'ensemble", section_title)
+        yield Paragraph(
             """Le tableau de bord est la page d'accueil après connexion. Il offre une vue 
             synthétique de l'activité de la pharmacie et des alertes importantes.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
-        elements.append(Paragraph("3.2 Indicateurs clés (KPI)", self.styles['SectionTitle']))
+        yield Paragraph("3.2 Indicateurs clés (KPI)", section_title)
         
-        kpi_data = [
-            ['Indicateur', 'Description'],
-            ['Chiffre d\'affaires du jour', 'Total des ventes validées aujourd\'hui'],
-            ['Nombre de ventes', 'Nombre de transactions du jour'],
-            ['Produits en stock', 'Nombre total de références en stock'],
-            ['Alertes stock faible', 'Produits sous le seuil d\'alerte'],
-            ['Alertes péremption', 'Produits expirant dans les 30 jours']
-        ]
+        kpi_table = Table(
+            _KPI_DATA,
+            colWidths=[5*cm, 8*cm],
+            rowHeights=self._row_heights(_KPI_DATA)
+        )
+        kpi_table.setStyle(_HEADER_TABLE_STYLE)
+        yield kpi_table
         
-        kpi_table = Table(kpi_data, colWidths=[5*cm, 8*cm])
-        kpi_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976D2')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
-        elements.append(kpi_table)
-        
-        elements.append(Spacer(1, 0.5*cm))
-        
-        elements.append(Paragraph("3.3 Alertes", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("3.3 Alertes", section_title)
+        yield Paragraph(
             """Les alertes vous informent des situations nécessitant votre attention :""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
         alerts = [
             "🔴 Stock faible : Produits dont la quantité est inférieure au seuil défini",
             "🟠 Péremption proche : Produits expirant dans les 30 prochains jours",
             "⚫ Rupture de stock : Produits avec une quantité de 0"
         ]
-        for alert in alerts:
-            elements.append(Paragraph(alert, self.styles['NormalText']))
-        
-        return elements
+        yield self._bullets(alerts)
     
     def _create_chapter_medicaments(self):
         """Chapitre 4: Gestion des médicaments."""
-        elements = []
+        chapter_title = self.styles['ChapterTitle']
+        section_title = self.styles['SectionTitle']
+        subtitle = self.styles['SubTitle']
+        normal = self.styles['NormalText']
         
-        elements.append(Paragraph("4. GESTION DES MÉDICAMENTS", self.styles['ChapterTitle']))
+        yield Paragraph("4. GESTION DES MÉDICAMENTS", chapter_title)
         
         # 4.1 Liste des médicaments
-        elements.append(Paragraph("4.1 Liste des médicaments", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("4.1 Liste des médicaments", section_title)
+        yield Paragraph(
             """La liste affiche tous les médicaments enregistrés dans le système. 
             Vous pouvez rechercher, filtrer et sélectionner un médicament pour voir ses détails.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
-        elements.append(Paragraph("Fonctionnalités de la liste :", self.styles['SubTitle']))
+        yield Paragraph("Fonctionnalités de la liste :", subtitle)
         list_features = [
             "• Barre de recherche : Recherchez par code, nom ou catégorie",
             "• Filtre par catégorie : Affichez uniquement une catégorie",
             "• Filtre 'En stock' : Masquez les produits en rupture",
             "• Tri : Cliquez sur un en-tête de colonne pour trier"
         ]
-        for feature in list_features:
-            elements.append(Paragraph(feature, self.styles['NormalText']))
-        
-        elements.append(Spacer(1, 0.5*cm))
+        yield self._bullets(list_features)
         
         # 4.2 Ajouter un médicament
-        elements.append(Paragraph("4.2 Ajouter un médicament", self.styles['SectionTitle']))
-        elements.append(Paragraph("Pour ajouter un nouveau médicament :", self.styles['SubTitle']))
+        yield Paragraph("4.2 Ajouter un médicament", section_title)
+        yield Paragraph("Pour ajouter un nouveau médicament :", subtitle)
         
         add_steps = [
             "1. Cliquez sur le bouton '➕ Nouveau'",
@@ -520,13 +959,10 @@ class GuideUtilisateurGenerator:
             "   • Description : Informations complémentaires",
             "4. Cliquez sur '💾 Enregistrer'"
         ]
-        for step in add_steps:
-            elements.append(Paragraph(step, self.styles['NormalText']))
-        
-        elements.append(Spacer(1, 0.5*cm))
+        yield self._bullets(add_steps)
         
         # 4.3 Modifier un médicament
-        elements.append(Paragraph("4.3 Modifier un médicament", self.styles['SectionTitle']))
+        yield Paragraph("4.3 Modifier un médicament", section_title)
         mod_steps = [
             "1. Sélectionnez le médicament dans la liste (simple clic)",
             "2. Double-cliquez pour passer en mode édition",
@@ -534,131 +970,85 @@ class GuideUtilisateurGenerator:
             "4. Cliquez sur '💾 Enregistrer' pour valider",
             "5. Ou cliquez sur '❌ Annuler' pour annuler les modifications"
         ]
-        for step in mod_steps:
-            elements.append(Paragraph(step, self.styles['NormalText']))
-        
-        elements.append(Spacer(1, 0.5*cm))
+        yield self._bullets(mod_steps)
         
         # 4.4 Gestion du stock
-        elements.append(Paragraph("4.4 Gestion du stock", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("4.4 Gestion du stock", section_title)
+        yield Paragraph(
             """Après avoir sélectionné un médicament, vous pouvez gérer son stock :""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
         stock_actions = [
             "• '➕ Ajouter stock' : Pour un réapprovisionnement (entrée de stock)",
             "• '🔧 Ajuster stock' : Pour corriger la quantité (inventaire)"
         ]
-        for action in stock_actions:
-            elements.append(Paragraph(action, self.styles['NormalText']))
+        yield self._bullets(stock_actions)
         
-        elements.append(Paragraph(
+        yield Paragraph(
             "💡 ASTUCE : Chaque mouvement de stock est enregistré dans l'historique "
             "pour assurer la traçabilité complète.",
             self.styles['Tip']
-        ))
-        
-        return elements
+        )
     
     def _create_chapter_pos(self):
         """Chapitre 5: Point de vente."""
-        elements = []
+        chapter_title = self.styles['ChapterTitle']
+        section_title = self.styles['SectionTitle']
+        normal = self.styles['NormalText']
         
-        elements.append(Paragraph("5. POINT DE VENTE (POS)", self.styles['ChapterTitle']))
+        yield Paragraph("5. POINT DE VENTE (POS)", chapter_title)
         
         # 5.1 Interface de vente
-        elements.append(Paragraph("5.1 Interface de vente", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("5.1 Interface de vente", section_title)
+        yield Paragraph(
             """L'interface de vente est divisée en deux parties :
             
             • Partie gauche : Panier avec les produits ajoutés
             • Partie droite : Informations client et totaux""",
-            self.styles['NormalText']
-        ))
-        
-        elements.append(Spacer(1, 0.5*cm))
+            normal
+        )
         
         # 5.2 Processus de vente
-        elements.append(Paragraph("5.2 Processus de vente complet", self.styles['SectionTitle']))
-        
-        sale_steps = [
-            "1. AJOUTER DES PRODUITS AU PANIER",
-            "   • Saisissez le code ou le nom du produit",
-            "   • Indiquez la quantité souhaitée",
-            "   • Cliquez sur '➕ Ajouter' ou appuyez sur Entrée",
-            "   • Utilisez '🔍 Rechercher' pour trouver un produit",
-            "",
-            "2. ASSOCIER UN CLIENT (optionnel)",
-            "   • Cliquez sur '🔍 Sélectionner' pour choisir un client existant",
-            "   • Ou cliquez sur '➕ Nouveau' pour créer un client rapidement",
-            "   • Le client bénéficiera de sa remise fidélité automatiquement",
-            "",
-            "3. VÉRIFIER LE PANIER",
-            "   • Vérifiez les quantités et les prix",
-            "   • Modifiez si nécessaire avec '🔄 Modifier qté'",
-            "   • Supprimez un produit avec '🗑️ Retirer'",
-            "",
-            "4. VALIDER LA VENTE",
-            "   • Vérifiez le total affiché",
-            "   • Cliquez sur '✅ VALIDER LA VENTE'",
-            "   • Confirmez la validation",
-            "",
-            "5. IMPRIMER LE TICKET",
-            "   • Après validation, choisissez d'imprimer le ticket",
-            "   • Le ticket PDF est généré et peut être imprimé"
-        ]
-        for step in sale_steps:
-            elements.append(Paragraph(step, self.styles['NormalText']))
+        yield Paragraph("5.2 Processus de vente complet", section_title)
         
-        elements.append(Spacer(1, 0.5*cm))
+        yield self._bullets(_SALE_STEPS)
         
         # 5.3 Gestion du panier
-        elements.append(Paragraph("5.3 Gestion du panier", self.styles['SectionTitle']))
-        
-        panier_data = [
-            ['Action', 'Description'],
-            ['➕ Ajouter', 'Ajoute un produit au panier'],
-            ['🔄 Modifier qté', 'Change la quantité d\'un produit'],
-            ['🗑️ Retirer', 'Supprime un produit du panier'],
-            ['🗑️ Vider panier', 'Supprime tous les produits'],
-            ['🆕 Nouvelle vente', 'Annule et recommence une nouvelle vente']
-        ]
+        yield Paragraph("5.3 Gestion du panier", section_title)
+        
+        panier_table = Table(
+            _PANIER_DATA,
+            colWidths=[4*cm, 9*cm],
+            rowHeights=self._row_heights(_PANIER_DATA)
+        )
+        panier_table.setStyle(_HEADER_TABLE_STYLE)
+        yield panier_table
         
-        panier_table = Table(panier_data, colWidths=[4*cm, 9*cm])
-        panier_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#1976D2')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
-        elements.append(panier_table)
-        
-        elements.append(Paragraph(
+        yield Paragraph(
             "⚠️ IMPORTANT : Vérifiez toujours le stock disponible avant de valider. "
             "Le système vous alertera si la quantité demandée dépasse le stock.",
             self.styles['ImportantNote']
-        ))
-        
-        return elements
+        )
     
     def _create_chapter_clients(self):
         """Chapitre 6: Gestion des clients."""
-        elements = []
+        chapter_title = self.styles['ChapterTitle']
+        section_title = self.styles['SectionTitle']
+        subtitle = self.styles['SubTitle']
+        normal = self.styles['NormalText']
         
-        elements.append(Paragraph("6. GESTION DES CLIENTS", self.styles['ChapterTitle']))
+        yield Paragraph("6. GESTION DES CLIENTS", chapter_title)
         
         # 6.1 Fichier clients
-        elements.append(Paragraph("6.1 Fichier clients", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("6.1 Fichier clients", section_title)
+        yield Paragraph(
             """Le module de gestion des clients permet de maintenir un fichier client 
             complet avec historique des achats et gestion de la fidélité.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
-        elements.append(Paragraph("Informations client :", self.styles['SubTitle']))
+        yield Paragraph("Informations client :", subtitle)
         client_fields = [
             "• Code client : Généré automatiquement (CLI-XXXXX)",
             "• Prénom et Nom : Identité du client",
@@ -666,61 +1056,48 @@ class GuideUtilisateurGenerator:
             "• Email : Communication électronique",
             "• Adresse : Adresse postale"
         ]
-        for field in client_fields:
-            elements.append(Paragraph(field, self.styles['NormalText']))
-        
-        elements.append(Spacer(1, 0.5*cm))
+        yield self._bullets(client_fields)
         
         # 6.2 Programme de fidélité
-        elements.append(Paragraph("6.2 Programme de fidélité", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("6.2 Programme de fidélité", section_title)
+        yield Paragraph(
             """Le programme de fidélité récompense automatiquement les clients réguliers :""",
-            self.styles['NormalText']
-        ))
-        
-        fidelity_data = [
-            ['Palier', 'Points requis', 'Remise'],
-            ['Standard', '0', '0%'],
-            ['Bronze', '100', '2%'],
-            ['Argent', '250', '5%'],
-            ['Or', '500', '8%'],
-            ['Platine', '1000', '10%']
-        ]
+            normal
+        )
         
-        fidelity_table = Table(fidelity_data, colWidths=[4*cm, 4*cm, 4*cm])
-        fidelity_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#FFC107')),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.grey),
-            ('PADDING', (0, 0), (-1, -1), 8),
-        ]))
-        elements.append(fidelity_table)
+        fidelity_table = Table(
+            _FIDELITY_DATA,
+            colWidths=[4*cm, 4*cm, 4*cm],
+            rowHeights=self._row_heights(_FIDELITY_DATA)
+        )
+        fidelity_table.setStyle(_FIDELITY_TABLE_STYLE)
+        yield fidelity_table
         
-        elements.append(Spacer(1, 0.3*cm))
+        yield _SPACE_03
         
-        elements.append(Paragraph(
+        yield Paragraph(
             "💡 Les points sont calculés automatiquement : 1 point pour chaque 10 GNF dépensés. "
             "La remise est appliquée automatiquement lors des ventes.",
             self.styles['Tip']
-        ))
-        
-        return elements
+        )
     
     def _create_chapter_reports(self):
         """Chapitre 7: Rapports."""
-        elements = []
+        chapter_title = self.styles['ChapterTitle']
+        section_title = self.styles['SectionTitle']
+        subtitle = self.styles['SubTitle']
+        normal = self.styles['NormalText']
         
-        elements.append(Paragraph("7. RAPPORTS ET STATISTIQUES", self.styles['ChapterTitle']))
+        yield Paragraph("7. RAPPORTS ET STATISTIQUES", chapter_title)
         
         # 7.1 Ventes par vendeur
-        elements.append(Paragraph("7.1 Ventes par vendeur", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("7.1 Ventes par vendeur", section_title)
+        yield Paragraph(
             """Ce rapport affiche la performance de chaque vendeur sur une période donnée.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
-        elements.append(Paragraph("Utilisation :", self.styles['SubTitle']))
+        yield Paragraph("Utilisation :", subtitle)
         report_steps = [
             "1. Sélectionnez la période (dates de début et fin)",
             "2. Cliquez sur '🔍 Générer le rapport'",
@@ -728,10 +1105,9 @@ class GuideUtilisateurGenerator:
             "4. Cliquez sur un vendeur pour voir le détail de ses ventes",
             "5. Exportez le rapport complet en CSV si nécessaire"
         ]
-        for step in report_steps:
-            elements.append(Paragraph(step, self.styles['NormalText']))
+        yield self._bullets(report_steps)
         
-        elements.append(Paragraph("Informations affichées :", self.styles['SubTitle']))
+        yield Paragraph("Informations affichées :", subtitle)
         info_displayed = [
             "• Nom du vendeur",
             "• Nombre total de ventes",
@@ -739,17 +1115,14 @@ class GuideUtilisateurGenerator:
             "• Panier moyen",
             "• Détail de chaque vente (produit, client, montant)"
         ]
-        for info in info_displayed:
-            elements.append(Paragraph(info, self.styles['NormalText']))
-        
-        elements.append(Spacer(1, 0.5*cm))
+        yield self._bullets(info_displayed)
         
         # 7.2 État du stock
-        elements.append(Paragraph("7.2 État du stock", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("7.2 État du stock", section_title)
+        yield Paragraph(
             """Ce rapport donne une vue complète de l'état actuel du stock.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
         stock_info = [
             "• Nombre total de produits",
@@ -758,48 +1131,46 @@ class GuideUtilisateurGenerator:
             "• Valeur totale du stock",
             "• Liste détaillée de tous les produits"
         ]
-        for info in stock_info:
-            elements.append(Paragraph(info, self.styles['NormalText']))
-        
-        elements.append(Spacer(1, 0.5*cm))
+        yield self._bullets(stock_info)
         
         # 7.3 Top produits
-        elements.append(Paragraph("7.3 Top produits", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("7.3 Top produits", section_title)
+        yield Paragraph(
             """Ce rapport identifie les produits les plus vendus sur une période.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
         # 7.4 Export
-        elements.append(Paragraph("7.4 Export des données", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("7.4 Export des données", section_title)
+        yield Paragraph(
             """Tous les rapports peuvent être exportés en format CSV pour analyse 
             dans Excel ou autre tableur.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
-        elements.append(Paragraph(
+        yield Paragraph(
             "💡 ASTUCE : Les fichiers CSV exportés utilisent le point-virgule (;) comme "
             "séparateur pour une meilleure compatibilité avec Excel en français.",
             self.styles['Tip']
-        ))
-        
-        return elements
+        )
     
     def _create_chapter_admin(self):
         """Chapitre 8: Administration."""
-        elements = []
+        chapter_title = self.styles['ChapterTitle']
+        section_title = self.styles['SectionTitle']
+        subtitle = self.styles['SubTitle']
+        normal = self.styles['NormalText']
         
-        elements.append(Paragraph("8. ADMINISTRATION", self.styles['ChapterTitle']))
+        yield Paragraph("8. ADMINISTRATION", chapter_title)
         
         # 8.1 Gestion des utilisateurs
-        elements.append(Paragraph("8.1 Gestion des utilisateurs", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("8.1 Gestion des utilisateurs", section_title)
+        yield Paragraph(
             """Seul l'administrateur peut gérer les comptes utilisateurs.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
-        elements.append(Paragraph("Créer un utilisateur :", self.styles['SubTitle']))
+        yield Paragraph("Créer un utilisateur :", subtitle)
         create_user_steps = [
             "1. Accédez au module 'Utilisateurs'",
             "2. Cliquez sur '➕ Nouveau'",
@@ -810,23 +1181,20 @@ class GuideUtilisateurGenerator:
             "   • Rôle (Admin, Pharmacien, Vendeur)",
             "4. Cliquez sur '💾 Enregistrer'"
         ]
-        for step in create_user_steps:
-            elements.append(Paragraph(step, self.styles['NormalText']))
+        yield self._bullets(create_user_steps)
         
-        elements.append(Paragraph(
+        yield Paragraph(
             "⚠️ IMPORTANT : Chaque utilisateur doit avoir son propre compte. "
             "Ne partagez jamais les identifiants de connexion.",
             self.styles['ImportantNote']
-        ))
-        
-        elements.append(Spacer(1, 0.5*cm))
+        )
         
         # 8.2 Sauvegarde
-        elements.append(Paragraph("8.2 Sauvegarde des données", self.styles['SectionTitle']))
-        elements.append(Paragraph(
+        yield Paragraph("8.2 Sauvegarde des données", section_title)
+        yield Paragraph(
             """La sauvegarde régulière de vos données est essentielle.""",
-            self.styles['NormalText']
-        ))
+            normal
+        )
         
         backup_steps = [
             "• Sauvegarde manuelle : Exécutez le script 'backup.bat'",
@@ -834,60 +1202,25 @@ class GuideUtilisateurGenerator:
             "• Emplacement : Dossier 'backups' dans l'application",
             "• Fréquence recommandée : Quotidienne"
         ]
-        for step in backup_steps:
-            elements.append(Paragraph(step, self.styles['NormalText']))
-        
-        return elements
+        yield self._bullets(backup_steps)
     
     def _create_chapter_faq(self):
         """Chapitre 9: FAQ."""
-        elements = []
-        
-        elements.append(Paragraph("9. FAQ ET DÉPANNAGE", self.styles['ChapterTitle']))
-        
-        faqs = [
-            {
-                'q': "L'application ne démarre pas",
-                'a': "Vérifiez que vous avez les droits d'exécution. "
-                     "Essayez de lancer en tant qu'administrateur. "
-                     "Vérifiez que l'antivirus ne bloque pas l'application."
-            },
-            {
-                'q': "J'ai oublié mon mot de passe",
-                'a': "Contactez l'administrateur qui peut réinitialiser votre mot de passe "
-                     "depuis le module de gestion des utilisateurs."
-            },
-            {
-                'q': "Le ticket ne s'imprime pas",
-                'a': "Vérifiez que votre imprimante est bien configurée comme imprimante par défaut. "
-                     "Le ticket est généré en PDF dans le dossier 'receipts'."
-            },
-            {
-                'q': "Comment annuler une vente ?",
-                'a': "Seuls l'administrateur et le pharmacien peuvent annuler une vente. "
-                     "Accédez à l'historique des ventes et utilisez la fonction d'annulation."
-            },
-            {
-                'q': "Les données sont-elles sécurisées ?",
-                'a': "Oui, les mots de passe sont cryptés et la base de données est locale. "
-                     "Effectuez des sauvegardes régulières pour éviter toute perte."
-            },
-            {
-                'q': "Comment mettre à jour l'application ?",
-                'a': "Faites une sauvegarde, fermez l'application, remplacez l'exécutable "
-                     "par la nouvelle version, puis relancez."
-            }
-        ]
+        chapter_title = self.styles['ChapterTitle']
+        section_title = self.styles['SectionTitle']
+        normal = self.styles['NormalText']
         
-        for faq in faqs:
-            elements.append(Paragraph(f"❓ {faq['q']}", self.styles['SectionTitle']))
-            elements.append(Paragraph(faq['a'], self.styles['NormalText']))
-            elements.append(Spacer(1, 0.3*cm))
+        yield Paragraph("9. FAQ ET DÉPANNAGE", chapter_title)
         
-        elements.append(Spacer(1, 1*cm))
+        for question, answer in _FAQ_RENDERED:
+            yield Paragraph(question, section_title)
+            yield Paragraph(answer, normal)
+            yield _SPACE_03
+        
+        yield _SPACE_1
         
         # Contact support
-        elements.append(Paragraph("SUPPORT TECHNIQUE", self.styles['SectionTitle']))
+        yield Paragraph("SUPPORT TECHNIQUE", section_title)
         
         support_info = [
             "📞 Téléphone : +224 627 171 397",
@@ -895,10 +1228,7 @@ class GuideUtilisateurGenerator:
             "💬 WhatsApp : +224 627 171 397",
             "🕐 Horaires : Lundi - Vendredi, 8h00 - 18h00"
         ]
-        for info in support_info:
-            elements.append(Paragraph(info, self.styles['NormalText']))
-        
-        return elements
+        yield self._bullets(support_info)
 
 
 # Exécution
@@ -16,7 +16,6 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 from config import UI_CONFIG
 from models.user import User
 from ui.login_view import LoginView
-from ui.main_window import MainWindow
 
 
 class PharmacyApp:
@@ -168,7 +167,10 @@ class PharmacyApp:
             except Exception:
                 pass
         
-        # Créer la vue principale
+        # Créer la vue principale (import différé : l'écran de connexion
+        # n'a pas besoin de charger toute l'arborescence des vues)
+        from ui.main_window import MainWindow
+        
         self._current_view = MainWindow(
             self._root,
             user=user,
@@ -8,9 +8,10 @@ Version: 1.0
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
+from models.dataclass_options import DATACLASS_OPTIONS, TRUSTED_LOAD
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Client:
     """
     Entité représentant un client.
@@ -45,6 +46,9 @@ class Client:
     
     def __post_init__(self):
         """Validation après initialisation."""
+        if TRUSTED_LOAD.get():
+            return
+        
         if not self.code or len(self.code.strip()) == 0:
             raise ValueError("Le code client est obligatoire")
         
@@ -0,0 +1,35 @@
+"""
+Options communes des dataclasses du modèle.
+
+Auteur: Alsény Camara
+Version: 1.0
+"""
+
+import sys
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+
+# slots=True supprime le __dict__ de chaque instance (Python 3.10+).
+# Sur les versions antérieures, les entités restent des dataclasses classiques.
+DATACLASS_OPTIONS = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+# Vrai pendant la reconstruction d'entités lues en base : ces données ont
+# déjà été validées à l'insertion, __post_init__ saute alors ses contrôles.
+TRUSTED_LOAD = ContextVar("trusted_load", default=False)
+
+
+@contextmanager
+def trusted_load() -> Iterator[None]:
+    """
+    Désactive la validation des entités construites dans le bloc.
+    
+    À réserver aux lignes lues depuis la base de données ; les saisies
+    utilisateur doivent toujours passer par la validation complète.
+    """
+    token = TRUSTED_LOAD.set(True)
+    try:
+        yield
+    finally:
+        TRUSTED_LOAD.reset(token)
@@ -8,9 +8,10 @@ Version: 1.0
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
+from models.dataclass_options import DATACLASS_OPTIONS, TRUSTED_LOAD
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class LoyaltyTier:
     """
     Entité représentant un palier du programme de fidélité.
@@ -35,6 +36,9 @@ class LoyaltyTier:
     
     def __post_init__(self):
         """Validation après initialisation."""
+        if TRUSTED_LOAD.get():
+            return
+        
         if not self.name or len(self.name.strip()) == 0:
             raise ValueError("Le nom du palier est obligatoire")
         
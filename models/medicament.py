@@ -8,14 +8,11 @@ Version: 1.0
 from dataclasses import dataclass
 from datetime import datetime, date
 from typing import Optional
-
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from models.dataclass_options import DATACLASS_OPTIONS, TRUSTED_LOAD
 from config import STOCK_CONFIG
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Medicament:
     """
     Entité représentant un médicament.
@@ -29,7 +26,8 @@ class Medicament:
         purchase_price: Prix d'achat HT
         selling_price: Prix de vente TTC
         quantity_in_stock: Quantité en stock
-        stock_threshold: Seuil d'alerte stock faible
+        stock_threshold: Seuil d'alerte stock faible (seuil par défaut
+            de la configuration si non renseigné)
         expiration_date: Date de péremption
         manufacturer: Fabricant / Laboratoire
         is_active: Statut actif (suppression logique)
@@ -45,7 +43,7 @@ class Medicament:
     description: Optional[str] = None
     category: Optional[str] = None
     quantity_in_stock: int = 0
-    stock_threshold: int = STOCK_CONFIG["default_threshold"]
+    stock_threshold: Optional[int] = None
     expiration_date: Optional[date] = None
     manufacturer: Optional[str] = None
     is_active: bool = True
@@ -54,6 +52,12 @@ class Medicament:
     
     def __post_init__(self):
         """Validation après initialisation."""
+        if self.stock_threshold is None:
+            self.stock_threshold = STOCK_CONFIG["default_threshold"]
+        
+        if TRUSTED_LOAD.get():
+            return
+        
         if not self.code or len(self.code.strip()) == 0:
             raise ValueError("Le code du médicament est obligatoire")
         
@@ -120,12 +124,18 @@ class Medicament:
         """Vérifie si le produit est en rupture."""
         return self.quantity_in_stock == 0
     
-    def is_expiring_soon(self, days: int = STOCK_CONFIG["expiry_alert_days"]) -> bool:
+    def is_expiring_soon(
+        self,
+        days: Optional[int] = None,
+        today: Optional[date] = None
+    ) -> bool:
         """
         Vérifie si le médicament expire bientôt.
         
         Args:
-            days: Nombre de jours pour l'alerte
+            days: Nombre de jours pour l'alerte (configuration par défaut)
+            today: Date de référence (aujourd'hui par défaut), à calculer
+                   une seule fois lors du parcours d'une liste
             
         Returns:
             bool: True si expire dans les X jours
@@ -133,21 +143,39 @@ class Medicament:
         if self.expiration_date is None:
             return False
         
-        today = date.today()
-        delta = (self.expiration_date - today).days
+        if days is None:
+            days = STOCK_CONFIG["expiry_alert_days"]
+        
+        delta = (self.expiration_date - (today or date.today())).days
         return 0 <= delta <= days
     
-    def is_expired(self) -> bool:
-        """Vérifie si le médicament est périmé."""
+    def is_expired(self, today: Optional[date] = None) -> bool:
+        """
+        Vérifie si le médicament est périmé.
+        
+        Args:
+            today: Date de référence (aujourd'hui par défaut)
+            
+        Returns:
+            bool: True si la date de péremption est dépassée
+        """
         if self.expiration_date is None:
             return False
-        return self.expiration_date < date.today()
+        return self.expiration_date < (today or date.today())
     
-    def days_until_expiry(self) -> Optional[int]:
-        """Retourne le nombre de jours avant péremption."""
+    def days_until_expiry(self, today: Optional[date] = None) -> Optional[int]:
+        """
+        Retourne le nombre de jours avant péremption.
+        
+        Args:
+            today: Date de référence (aujourd'hui par défaut)
+            
+        Returns:
+            Optional[int]: Jours restants, None sans date de péremption
+        """
         if self.expiration_date is None:
             return None
-        return (self.expiration_date - date.today()).days
+        return (self.expiration_date - (today or date.today())).days
     
     def get_margin(self) -> float:
         """Calcule la marge brute."""
@@ -7,11 +7,12 @@ Version: 1.0
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, List
+from typing import Optional, List, Dict
+from models.dataclass_options import DATACLASS_OPTIONS, TRUSTED_LOAD
 from models.sale_line import SaleLine
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Sale:
     """
     Entité représentant une vente.
@@ -52,8 +53,16 @@ class Sale:
     client_name: Optional[str] = None
     seller_name: Optional[str] = None
     
+    # Nombre total d'articles, tenu à jour par add_line/remove_line/set_lines
+    _items_count: int = field(default=0, init=False, repr=False, compare=False)
+    
     def __post_init__(self):
         """Validation après initialisation."""
+        self._items_count = sum(line.quantity for line in self.lines)
+        
+        if TRUSTED_LOAD.get():
+            return
+        
         if not self.sale_number or len(self.sale_number.strip()) == 0:
             raise ValueError("Le numéro de vente est obligatoire")
         
@@ -112,6 +121,43 @@ class Sale:
             seller_name=data.get('seller_name')
         )
     
+    @classmethod
+    def from_row(cls, row: tuple, columns: Dict[str, int]) -> 'Sale':
+        """
+        Crée une instance depuis un tuple SQL.
+        
+        Args:
+            row: Ligne brute retournée par la base
+            columns: Index des colonnes (nom -> position)
+            
+        Returns:
+            Sale: Instance créée
+        """
+        sale_date = row[columns['sale_date']]
+        if sale_date and isinstance(sale_date, str):
+            sale_date = datetime.fromisoformat(sale_date)
+        
+        client_name = columns.get('client_name')
+        seller_name = columns.get('seller_name')
+        
+        return cls(
+            id=row[columns['id']],
+            sale_number=row[columns['sale_number']],
+            client_id=row[columns['client_id']],
+            user_id=row[columns['user_id']],
+            sale_date=sale_date or datetime.now(),
+            subtotal=float(row[columns['subtotal']] or 0),
+            discount_percentage=float(row[columns['discount_percentage']] or 0),
+            discount_amount=float(row[columns['discount_amount']] or 0),
+            total=float(row[columns['total']] or 0),
+            loyalty_points_earned=int(row[columns['loyalty_points_earned']] or 0),
+            loyalty_points_used=int(row[columns['loyalty_points_used']] or 0),
+            status=row[columns['status']] or 'completed',
+            created_at=row[columns['created_at']],
+            client_name=row[client_name] if client_name is not None else None,
+            seller_name=row[seller_name] if seller_name is not None else None
+        )
+    
     def is_completed(self) -> bool:
         """Vérifie si la vente est terminée."""
         return self.status == 'completed'
@@ -123,7 +169,31 @@ class Sale:
     def add_line(self, line: 'SaleLine') -> None:
         """Ajoute une ligne à la vente."""
         self.lines.append(line)
+        self._items_count += line.quantity
+    
+    def remove_line(self, line: 'SaleLine') -> None:
+        """
+        Retire une ligne de la vente.
+        
+        Args:
+            line: Ligne à retirer
+            
+        Raises:
+            ValueError: Si la ligne n'appartient pas à la vente
+        """
+        self.lines.remove(line)
+        self._items_count -= line.quantity
+    
+    def set_lines(self, lines: List['SaleLine']) -> None:
+        """
+        Remplace les lignes de la vente.
+        
+        Args:
+            lines: Nouvelles lignes de vente
+        """
+        self.lines = lines
+        self._items_count = sum(line.quantity for line in lines)
     
     def get_items_count(self) -> int:
         """Retourne le nombre total d'articles."""
-        return sum(line.quantity for line in self.lines)
\ No newline at end of file
+        return self._items_count
\ No newline at end of file
@@ -7,10 +7,11 @@ Version: 1.0
 
 from dataclasses import dataclass
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict
+from models.dataclass_options import DATACLASS_OPTIONS, TRUSTED_LOAD
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class SaleLine:
     """
     Entité représentant une ligne de détail d'une vente.
@@ -41,6 +42,9 @@ class SaleLine:
     
     def __post_init__(self):
         """Validation après initialisation."""
+        if TRUSTED_LOAD.get():
+            return
+        
         if self.quantity <= 0:
             raise ValueError("La quantité doit être supérieure à zéro")
         
@@ -77,6 +81,33 @@ class SaleLine:
             medicament_code=data.get('medicament_code')
         )
     
+    @classmethod
+    def from_row(cls, row: tuple, columns: Dict[str, int]) -> 'SaleLine':
+        """
+        Crée une instance depuis un tuple SQL.
+        
+        Args:
+            row: Ligne brute retournée par la base
+            columns: Index des colonnes (nom -> position)
+            
+        Returns:
+            SaleLine: Instance créée
+        """
+        medicament_name = columns.get('medicament_name')
+        medicament_code = columns.get('medicament_code')
+        
+        return cls(
+            id=row[columns['id']],
+            sale_id=row[columns['sale_id']],
+            medicament_id=row[columns['medicament_id']],
+            quantity=int(row[columns['quantity']]),
+            unit_price=float(row[columns['unit_price']]),
+            line_total=float(row[columns['line_total']]),
+            created_at=row[columns['created_at']],
+            medicament_name=row[medicament_name] if medicament_name is not None else None,
+            medicament_code=row[medicament_code] if medicament_code is not None else None
+        )
+    
     def calculate_total(self) -> float:
         """Recalcule le total de la ligne."""
         return self.quantity * self.unit_price
\ No newline at end of file
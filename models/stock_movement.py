@@ -8,9 +8,10 @@ Version: 1.0
 from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
+from models.dataclass_options import DATACLASS_OPTIONS, TRUSTED_LOAD
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class StockMovement:
     """
     Entité représentant un mouvement de stock.
@@ -41,6 +42,9 @@ class StockMovement:
     
     def __post_init__(self):
         """Validation après initialisation."""
+        if TRUSTED_LOAD.get():
+            return
+        
         if self.movement_type not in ('entry', 'exit', 'adjustment'):
             raise ValueError(f"Type de mouvement invalide: {self.movement_type}")
         
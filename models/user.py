@@ -7,10 +7,11 @@ Version: 1.0
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from typing import Optional, Dict
+from models.dataclass_options import DATACLASS_OPTIONS, TRUSTED_LOAD
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class User:
     """
     Entité représentant un utilisateur du système.
@@ -37,6 +38,9 @@ class User:
     
     def __post_init__(self):
         """Validation après initialisation."""
+        if TRUSTED_LOAD.get():
+            return
+        
         if self.role not in ('admin', 'pharmacien', 'vendeur'):
             raise ValueError(f"Rôle invalide: {self.role}")
         
@@ -86,6 +90,29 @@ class User:
             updated_at=data.get('updated_at')
         )
     
+    @classmethod
+    def from_row(cls, row: tuple, columns: Dict[str, int]) -> 'User':
+        """
+        Crée une instance User depuis un tuple SQL.
+        
+        Args:
+            row: Ligne brute retournée par la base
+            columns: Index des colonnes (nom -> position)
+            
+        Returns:
+            User: Instance créée
+        """
+        return cls(
+            id=row[columns['id']],
+            username=row[columns['username']],
+            password_hash=row[columns['password_hash']],
+            role=row[columns['role']],
+            full_name=row[columns['full_name']],
+            is_active=bool(row[columns['is_active']]),
+            created_at=row[columns['created_at']],
+            updated_at=row[columns['updated_at']]
+        )
+    
     def is_admin(self) -> bool:
         """Vérifie si l'utilisateur est administrateur."""
         return self.role == 'admin'
@@ -5,48 +5,80 @@ Auteur: Alsény Camara
 Version: 1.0
 """
 
-from typing import List, Dict, Any
-from dataclasses import dataclass
-from enum import Enum
-
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from typing import List, Dict, Any, Tuple
+from datetime import date
+from dataclasses import dataclass, field
+from operator import attrgetter
 
 from models.medicament import Medicament
+from models.dataclass_options import DATACLASS_OPTIONS
 from database.medicament_repository import MedicamentRepository
 from config import STOCK_CONFIG
 
 
-class AlertType(Enum):
-    """Types d'alertes."""
+class AlertType:
+    """Énumération des types d'alertes."""
     LOW_STOCK = "low_stock"
     EXPIRING_SOON = "expiring_soon"
     EXPIRED = "expired"
     OUT_OF_STOCK = "out_of_stock"
 
 
-class AlertSeverity(Enum):
-    """Niveaux de sévérité des alertes."""
+class AlertSeverity:
+    """Énumération des niveaux de sévérité des alertes."""
     INFO = "info"
     WARNING = "warning"
     CRITICAL = "critical"
 
 
-@dataclass
+# Paramètres de détection, lus une fois au chargement du module
+_CRITICAL_STOCK_THRESHOLD = STOCK_CONFIG.get("low_stock_critical_threshold", 5)
+_EXPIRY_ALERT_DAYS = STOCK_CONFIG.get("expiry_alert_days", 30)
+
+# Ordre de tri des alertes (critiques en premier)
+_SEVERITY_ORDER = {
+    AlertSeverity.CRITICAL: 0,
+    AlertSeverity.WARNING: 1,
+    AlertSeverity.INFO: 2
+}
+
+# Sévérité et titre des alertes de péremption par tranche de 8 jours:
+# 0-7 jours, 8-15 jours, au-delà
+_EXPIRY_LEVELS = (
+    (AlertSeverity.CRITICAL, "Péremption imminente"),
+    (AlertSeverity.WARNING, "Péremption proche"),
+    (AlertSeverity.INFO, "Péremption à surveiller")
+)
+
+# Clés de get_alerts_count par type d'alerte (les sévérités sont
+# comptées sous leur propre valeur)
+_TYPE_COUNT_KEYS = {
+    AlertType.LOW_STOCK: 'low_stock',
+    AlertType.EXPIRING_SOON: 'expiring',
+    AlertType.EXPIRED: 'expired',
+    AlertType.OUT_OF_STOCK: 'out_of_stock'
+}
+
+
+@dataclass(**DATACLASS_OPTIONS)
 class Alert:
     """Représente une alerte."""
-    alert_type: AlertType
-    severity: AlertSeverity
+    alert_type: str
+    severity: str
     title: str
     message: str
     medicament: Medicament
+    sort_key: int = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        """Calcule la clé de tri à partir de la sévérité."""
+        self.sort_key = _SEVERITY_ORDER.get(self.severity, 99)
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertit en dictionnaire."""
         return {
-            'type': self.alert_type.value,
-            'severity': self.severity.value,
+            'type': self.alert_type,
+            'severity': self.severity,
             'title': self.title,
             'message': self.message,
             'medicament_id': self.medicament.id,
@@ -76,31 +108,35 @@ class AlertService:
         Returns:
             List[Alert]: Liste des alertes triées par sévérité
         """
+        # Une seule requête pour les trois catégories de médicaments
+        low_stock, expired, expiring = self._medicament_repo.get_alert_candidates(
+            _EXPIRY_ALERT_DAYS
+        )
+        
         alerts = []
         
         # Alertes de stock
-        alerts.extend(self._get_stock_alerts())
+        alerts.extend(self._get_stock_alerts(low_stock))
         
         # Alertes de péremption
-        alerts.extend(self._get_expiration_alerts())
+        alerts.extend(self._get_expiration_alerts(expired, expiring))
         
         # Trier par sévérité (critical first)
-        severity_order = {
-            AlertSeverity.CRITICAL: 0,
-            AlertSeverity.WARNING: 1,
-            AlertSeverity.INFO: 2
-        }
-        
-        alerts.sort(key=lambda a: severity_order.get(a.severity, 99))
+        alerts.sort(key=attrgetter('sort_key'))
         
         return alerts
     
-    def _get_stock_alerts(self) -> List[Alert]:
-        """Génère les alertes de stock."""
-        alerts = []
+    def _get_stock_alerts(self, low_stock_meds: List[Medicament]) -> List[Alert]:
+        """
+        Génère les alertes de stock.
         
-        low_stock_meds = self._medicament_repo.get_low_stock()
-        critical_threshold = STOCK_CONFIG.get("low_stock_critical_threshold", 5)
+        Args:
+            low_stock_meds: Médicaments sous le seuil d'alerte
+            
+        Returns:
+            List[Alert]: Alertes de rupture et de stock faible
+        """
+        alerts = []
         
         for med in low_stock_meds:
             if med.quantity_in_stock == 0:
@@ -112,7 +148,7 @@ class AlertService:
                     message=f"{med.name} est en rupture de stock",
                     medicament=med
                 ))
-            elif med.quantity_in_stock <= critical_threshold:
+            elif med.quantity_in_stock <= _CRITICAL_STOCK_THRESHOLD:
                 # Stock critique
                 alerts.append(Alert(
                     alert_type=AlertType.LOW_STOCK,
@@ -133,12 +169,24 @@ class AlertService:
         
         return alerts
     
-    def _get_expiration_alerts(self) -> List[Alert]:
-        """Génère les alertes de péremption."""
+    def _get_expiration_alerts(
+        self,
+        expired: List[Medicament],
+        expiring: List[Medicament]
+    ) -> List[Alert]:
+        """
+        Génère les alertes de péremption.
+        
+        Args:
+            expired: Médicaments périmés
+            expiring: Médicaments expirant bientôt
+            
+        Returns:
+            List[Alert]: Alertes de péremption
+        """
         alerts = []
         
         # Médicaments expirés
-        expired = self._medicament_repo.get_expired()
         for med in expired:
             alerts.append(Alert(
                 alert_type=AlertType.EXPIRED,
@@ -149,21 +197,12 @@ class AlertService:
             ))
         
         # Médicaments expirant bientôt
-        expiring_days = STOCK_CONFIG.get("expiry_alert_days", 30)
-        expiring = self._medicament_repo.get_expiring_soon(expiring_days)
+        today = date.today()
         
         for med in expiring:
-            days = med.days_until_expiry()
-            
-            if days <= 7:
-                severity = AlertSeverity.CRITICAL
-                title = "Péremption imminente"
-            elif days <= 15:
-                severity = AlertSeverity.WARNING
-                title = "Péremption proche"
-            else:
-                severity = AlertSeverity.INFO
-                title = "Péremption à surveiller"
+            # expiration_date est toujours renseignée (filtre de la requête)
+            days = (med.expiration_date - today).days
+            severity, title = _EXPIRY_LEVELS[min(days // 8, 2) if days >= 0 else 0]
             
             alerts.append(Alert(
                 alert_type=AlertType.EXPIRING_SOON,
@@ -175,12 +214,15 @@ class AlertService:
         
         return alerts
     
-    def get_alerts_count(self) -> Dict[str, int]:
+    def get_alerts_with_counts(self) -> Tuple[List[Alert], Dict[str, int]]:
         """
-        Retourne le compte des alertes par type.
+        Récupère les alertes et leurs compteurs en une seule détection.
+        
+        À utiliser lorsque la liste et les compteurs sont tous deux
+        affichés : les requêtes de stock ne sont exécutées qu'une fois.
         
         Returns:
-            dict: Compteurs par type et total
+            Tuple[List[Alert], Dict[str, int]]: (alertes triées, compteurs)
         """
         alerts = self.get_all_alerts()
         
@@ -196,25 +238,19 @@ class AlertService:
         }
         
         for alert in alerts:
-            # Par sévérité
-            if alert.severity == AlertSeverity.CRITICAL:
-                counts['critical'] += 1
-            elif alert.severity == AlertSeverity.WARNING:
-                counts['warning'] += 1
-            else:
-                counts['info'] += 1
-            
-            # Par type
-            if alert.alert_type == AlertType.LOW_STOCK:
-                counts['low_stock'] += 1
-            elif alert.alert_type == AlertType.EXPIRING_SOON:
-                counts['expiring'] += 1
-            elif alert.alert_type == AlertType.EXPIRED:
-                counts['expired'] += 1
-            elif alert.alert_type == AlertType.OUT_OF_STOCK:
-                counts['out_of_stock'] += 1
-        
-        return counts
+            counts[alert.severity] += 1
+            counts[_TYPE_COUNT_KEYS[alert.alert_type]] += 1
+        
+        return alerts, counts
+    
+    def get_alerts_count(self) -> Dict[str, int]:
+        """
+        Retourne le compte des alertes par type.
+        
+        Returns:
+            dict: Compteurs par type et total
+        """
+        return self.get_alerts_with_counts()[1]
     
     def get_low_stock_medicaments(self) -> List[Medicament]:
         """Retourne les médicaments avec stock faible."""
@@ -223,7 +259,7 @@ class AlertService:
     def get_expiring_medicaments(self, days: int = None) -> List[Medicament]:
         """Retourne les médicaments expirant bientôt."""
         if days is None:
-            days = STOCK_CONFIG.get("expiry_alert_days", 30)
+            days = _EXPIRY_ALERT_DAYS
         return self._medicament_repo.get_expiring_soon(days)
     
     def get_expired_medicaments(self) -> List[Medicament]:
@@ -5,18 +5,20 @@ Auteur: Alsény Camara
 Version: 1.0
 """
 
-from typing import Optional, Tuple, Dict
-from datetime import datetime, timedelta
-
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
 
 from models.user import User
 from database.user_repository import UserRepository
 from utils.hash_utils import HashUtils
 from config import AUTH_CONFIG, UserRole
 
+# Paramètres de blocage, lus une fois au chargement du module
+_MAX_LOGIN_ATTEMPTS = AUTH_CONFIG.get("max_login_attempts", 3)
+_LOCKOUT_MINUTES = AUTH_CONFIG.get("lockout_duration_minutes", 15)
+_LOCKOUT_SECONDS = _LOCKOUT_MINUTES * 60
+
 
 class AuthService:
     """
@@ -32,8 +34,12 @@ class AuthService:
     # Utilisateur actuellement connecté (session)
     _current_user: Optional[User] = None
     
-    # Compteur de tentatives par username
-    _login_attempts: Dict[str, Tuple[int, datetime]] = {}
+    # Nombre maximal d'identifiants suivis (les plus anciens sont oubliés)
+    MAX_TRACKED_USERNAMES = 10000
+    
+    # Compteur de tentatives par username, du plus ancien au plus récent échec
+    # (instant du dernier échec en secondes de time.monotonic())
+    _login_attempts: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
     
     def __init__(self):
         """Initialise le service avec le repository."""
@@ -86,6 +92,11 @@ class AuthService:
             remaining = self._get_lockout_remaining(username)
             return False, f"Compte bloqué. Réessayez dans {remaining} minutes", None
         
+        # Hasher le mot de passe saisi avant la lecture en base: le calcul
+        # ne dépend pas de l'utilisateur et le coût reste identique que
+        # l'identifiant existe ou non
+        candidate_hash = HashUtils.hash_password(password)
+        
         # Récupérer l'utilisateur
         user = self._user_repository.get_by_username(username)
         
@@ -98,7 +109,7 @@ class AuthService:
             return False, "Ce compte est désactivé", None
         
         # Vérifier le mot de passe
-        if not HashUtils.verify_password(password, user.password_hash):
+        if not HashUtils.verify_hash(candidate_hash, user.password_hash):
             self._record_failed_attempt(username)
             attempts = self._get_remaining_attempts(username)
             return False, f"Identifiant ou mot de passe incorrect. {attempts} tentative(s) restante(s)", None
@@ -115,12 +126,9 @@ class AuthService:
             return False
         
         attempts, last_attempt = self._login_attempts[username]
-        max_attempts = AUTH_CONFIG.get("max_login_attempts", 3)
-        lockout_minutes = AUTH_CONFIG.get("lockout_duration_minutes", 15)
         
-        if attempts >= max_attempts:
-            lockout_until = last_attempt + timedelta(minutes=lockout_minutes)
-            if datetime.now() < lockout_until:
+        if attempts >= _MAX_LOGIN_ATTEMPTS:
+            if time.monotonic() - last_attempt < _LOCKOUT_SECONDS:
                 return True
             else:
                 # Blocage expiré, réinitialiser
@@ -135,29 +143,52 @@ class AuthService:
             return 0
         
         _, last_attempt = self._login_attempts[username]
-        lockout_minutes = AUTH_CONFIG.get("lockout_duration_minutes", 15)
-        lockout_until = last_attempt + timedelta(minutes=lockout_minutes)
-        remaining = (lockout_until - datetime.now()).total_seconds() / 60
+        remaining = (_LOCKOUT_SECONDS - (time.monotonic() - last_attempt)) / 60
         
         return max(0, int(remaining) + 1)
     
     def _record_failed_attempt(self, username: str) -> None:
-        """Enregistre une tentative échouée."""
+        """
+        Enregistre une tentative échouée.
+        
+        Les échecs plus anciens que la durée de blocage sont oubliés et le
+        nombre d'identifiants suivis est borné, pour que des tentatives sur
+        de nombreux identifiants ne fassent pas grossir la table.
+        """
+        now = time.monotonic()
+        
         if username in self._login_attempts:
             attempts, _ = self._login_attempts[username]
-            self._login_attempts[username] = (attempts + 1, datetime.now())
+            self._login_attempts[username] = (attempts + 1, now)
+            self._login_attempts.move_to_end(username)
         else:
-            self._login_attempts[username] = (1, datetime.now())
+            self._login_attempts[username] = (1, now)
+        
+        self._prune_attempts(now)
+    
+    def _prune_attempts(self, now: float) -> None:
+        """Supprime les échecs expirés et les plus anciens au-delà de la limite."""
+        attempts_map = self._login_attempts
+        expired_before = now - _LOCKOUT_SECONDS
+        
+        # Les entrées sont triées par dernier échec: seules les premières
+        # peuvent être expirées
+        while attempts_map:
+            _, last_attempt = next(iter(attempts_map.values()))
+            if last_attempt >= expired_before:
+                break
+            attempts_map.popitem(last=False)
+        
+        while len(attempts_map) > self.MAX_TRACKED_USERNAMES:
+            attempts_map.popitem(last=False)
     
     def _get_remaining_attempts(self, username: str) -> int:
         """Retourne le nombre de tentatives restantes."""
-        max_attempts = AUTH_CONFIG.get("max_login_attempts", 3)
-        
         if username not in self._login_attempts:
-            return max_attempts
+            return _MAX_LOGIN_ATTEMPTS
         
         attempts, _ = self._login_attempts[username]
-        return max(0, max_attempts - attempts)
+        return max(0, _MAX_LOGIN_ATTEMPTS - attempts)
     
     def _clear_attempts(self, username: str) -> None:
         """Réinitialise le compteur de tentatives."""
@@ -6,10 +6,7 @@ Version: 1.0
 """
 
 from typing import Optional, Tuple, List
-
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bisect import bisect_right
 
 from models.client import Client
 from models.loyalty_tier import LoyaltyTier
@@ -18,6 +15,11 @@ from database.loyalty_tier_repository import LoyaltyTierRepository
 from config import LOYALTY_CONFIG
 
 
+# Paramètres du programme, lus une fois au chargement du module
+_POINTS_PER_UNIT = LOYALTY_CONFIG.get("points_per_unit", 10)
+_POINT_VALUE = LOYALTY_CONFIG.get("points_value", 0.1)
+
+
 class LoyaltyService:
     """
     Service gérant le programme de fidélité.
@@ -33,6 +35,15 @@ class LoyaltyService:
         self._client_repo = ClientRepository()
         self._tier_repo = LoyaltyTierRepository()
     
+    def _get_tier_table(self) -> Tuple[List[int], List[LoyaltyTier]]:
+        """
+        Retourne la table des paliers actifs triés par seuil.
+        
+        Returns:
+            Tuple[List[int], List[LoyaltyTier]]: (seuils de points, paliers)
+        """
+        return self._tier_repo.get_tier_table()
+    
     def calculate_points_earned(self, amount: float) -> int:
         """
         Calcule les points gagnés pour un montant.
@@ -43,12 +54,10 @@ class LoyaltyService:
         Returns:
             int: Nombre de points gagnés
         """
-        points_per_unit = LOYALTY_CONFIG.get("points_per_unit", 10)
-        
-        if amount <= 0 or points_per_unit <= 0:
+        if amount <= 0 or _POINTS_PER_UNIT <= 0:
             return 0
         
-        return int(amount // points_per_unit)
+        return int(amount // _POINTS_PER_UNIT)
     
     def calculate_points_value(self, points: int) -> float:
         """
@@ -60,8 +69,7 @@ class LoyaltyService:
         Returns:
             float: Valeur en devise
         """
-        point_value = LOYALTY_CONFIG.get("points_value", 0.1)
-        return points * point_value
+        return points * _POINT_VALUE
     
     def get_client_tier(self, client: Client) -> Optional[LoyaltyTier]:
         """
@@ -76,7 +84,10 @@ class LoyaltyService:
         if client is None:
             return None
         
-        return self._tier_repo.get_tier_for_points(client.loyalty_points)
+        min_points, tiers = self._get_tier_table()
+        index = bisect_right(min_points, client.loyalty_points) - 1
+        
+        return tiers[index] if index >= 0 else None
     
     def get_client_discount(self, client: Client) -> float:
         """
@@ -189,7 +200,7 @@ class LoyaltyService:
     
     def get_all_tiers(self) -> List[LoyaltyTier]:
         """Retourne tous les paliers."""
-        return self._tier_repo.get_all()
+        return list(self._get_tier_table()[1])
     
     def get_next_tier(self, client: Client) -> Tuple[Optional[LoyaltyTier], int]:
         """
@@ -205,13 +216,12 @@ class LoyaltyService:
         if client is None:
             return None, 0
         
-        tiers = self.get_all_tiers()
+        min_points, tiers = self._get_tier_table()
         current_points = client.loyalty_points
+        index = bisect_right(min_points, current_points)
         
-        for tier in tiers:
-            if tier.min_points > current_points:
-                points_needed = tier.min_points - current_points
-                return tier, points_needed
+        if index < len(tiers):
+            return tiers[index], min_points[index] - current_points
         
         # Client au palier maximum
         return None, 0
@@ -5,13 +5,12 @@ Auteur: Alsény Camara
 Version: 1.0
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Iterator, Sequence
 from datetime import date, datetime, timedelta
 from dataclasses import dataclass
 
-import sys
+import csv
 import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from database.sale_repository import SaleRepository
 from database.medicament_repository import MedicamentRepository
@@ -20,6 +19,18 @@ from database.stock_movement_repository import StockMovementRepository
 from config import BASE_DIR
 
 
+# Formats d'affichage des dates
+_DATE_FORMAT = "%d/%m/%Y"
+_DATETIME_FORMAT = "%d/%m/%Y %H:%M"
+
+# Libellés des types de mouvement de stock
+_MOVEMENT_TYPE_LABELS = {
+    'entry': 'Entrée',
+    'exit': 'Sortie',
+    'adjustment': 'Ajustement'
+}
+
+
 @dataclass
 class ReportPeriod:
     """Période d'un rapport."""
@@ -57,13 +68,13 @@ class ReportService:
     
     def _format_date(self, d: date) -> str:
         """Formate une date pour affichage."""
-        return d.strftime("%d/%m/%Y")
+        return d.strftime(_DATE_FORMAT)
     
     def _format_datetime(self, dt: datetime) -> str:
         """Formate une date/heure pour affichage."""
         if isinstance(dt, str):
             dt = datetime.fromisoformat(dt)
-        return dt.strftime("%d/%m/%Y %H:%M")
+        return dt.strftime(_DATETIME_FORMAT)
     
     def _format_currency(self, amount: float) -> str:
         """Formate un montant en devise."""
@@ -81,6 +92,7 @@ class ReportService:
             dict: Statistiques principales
         """
         today = date.today()
+        stock = self._medicament_repo.get_stock_summary()
         
         return {
             # Ventes du jour
@@ -88,10 +100,10 @@ class ReportService:
             'today_sales_total': self._sale_repo.get_daily_total(today),
             
             # Stock
-            'total_products': self._medicament_repo.count_total(),
-            'low_stock_count': self._medicament_repo.count_low_stock(),
-            'expiring_soon_count': self._medicament_repo.count_expiring_soon(),
-            'stock_value': self._medicament_repo.get_total_stock_value(),
+            'total_products': stock['total_products'],
+            'low_stock_count': stock['low_stock_count'],
+            'expiring_soon_count': stock['expiring_soon_count'],
+            'stock_value': stock['total_value'],
             
             # Clients
             'total_clients': self._client_repo.count_total()
@@ -114,19 +126,28 @@ class ReportService:
         """
         sales = self._sale_repo.get_by_date_range(start_date, end_date)
         
-        # Filtrer les ventes complétées
-        completed_sales = [s for s in sales if s.status == 'completed']
-        cancelled_sales = [s for s in sales if s.status == 'cancelled']
-        
-        # Calculs
-        total_revenue = sum(s.total for s in completed_sales)
-        total_discount = sum(s.discount_amount for s in completed_sales)
-        total_items = sum(s.get_items_count() for s in completed_sales)
-        
-        avg_sale = total_revenue / len(completed_sales) if completed_sales else 0
+        # Calculs sur les ventes complétées (un seul parcours)
+        completed_count = 0
+        cancelled_count = 0
+        total_revenue = 0.0
+        total_discount = 0.0
+        total_items = 0
+        for s in sales:
+            if s.status == 'completed':
+                completed_count += 1
+                total_revenue += s.total
+                total_discount += s.discount_amount
+                total_items += s.get_items_count()
+            elif s.status == 'cancelled':
+                cancelled_count += 1
+        
+        avg_sale = total_revenue / completed_count if completed_count else 0
         
         # Ventes par jour
-        daily_sales = self._aggregate_daily_sales(completed_sales)
+        daily_sales = self._aggregate_daily_sales(start_date, end_date)
+        
+        # Les dates de vente sont des datetime dès le chargement
+        round_currency = self._round_currency
         
         return {
             'period': {
@@ -134,8 +155,8 @@ class ReportService:
                 'end': self._format_date(end_date)
             },
             'summary': {
-                'total_sales': len(completed_sales),
-                'cancelled_sales': len(cancelled_sales),
+                'total_sales': completed_count,
+                'cancelled_sales': cancelled_count,
                 'total_revenue': self._round_currency(total_revenue),
                 'total_discount': self._round_currency(total_discount),
                 'total_items': total_items,
@@ -144,10 +165,10 @@ class ReportService:
             'sales': [
                 {
                     'sale_number': s.sale_number,
-                    'sale_date': self._format_datetime(s.sale_date),
+                    'sale_date': s.sale_date.strftime(_DATETIME_FORMAT),
                     'client_name': s.client_name or 'Anonyme',
                     'seller_name': s.seller_name,
-                    'total': self._round_currency(s.total),
+                    'total': round_currency(s.total),
                     'items_count': s.get_items_count(),
                     'status': s.status
                 }
@@ -156,42 +177,29 @@ class ReportService:
             'daily_breakdown': daily_sales
         }
     
-    def _aggregate_daily_sales(self, sales: List) -> List[Dict[str, Any]]:
+    def _aggregate_daily_sales(
+        self,
+        start_date: date,
+        end_date: date
+    ) -> List[Dict[str, Any]]:
         """
-        Agrège les ventes par jour.
+        Agrège les ventes complétées par jour.
         
         Args:
-            sales: Liste des ventes
+            start_date: Date de début
+            end_date: Date de fin
             
         Returns:
             list: Ventes agrégées par jour
         """
-        daily = {}
-        
-        for sale in sales:
-            sale_date = sale.sale_date
-            if isinstance(sale_date, str):
-                sale_date = datetime.fromisoformat(sale_date)
-            
-            day_key = sale_date.date().isoformat()
-            
-            if day_key not in daily:
-                daily[day_key] = {
-                    'date': self._format_date(sale_date.date()),
-                    'count': 0,
-                    'total': 0.0
-                }
-            
-            daily[day_key]['count'] += 1
-            daily[day_key]['total'] += sale.total
-        
-        # Convertir en liste et arrondir
-        result = []
-        for day_data in daily.values():
-            day_data['total'] = self._round_currency(day_data['total'])
-            result.append(day_data)
-        
-        return sorted(result, key=lambda x: x['date'])
+        return [
+            {
+                'date': self._format_date(date.fromisoformat(day)),
+                'count': count,
+                'total': self._round_currency(total)
+            }
+            for day, count, total in self._sale_repo.get_daily_aggregates(start_date, end_date)
+        ]
     
     def get_stock_report(self) -> Dict[str, Any]:
         """
@@ -205,13 +213,19 @@ class ReportService:
         expiring_soon = self._medicament_repo.get_expiring_soon()
         expired = self._medicament_repo.get_expired()
         
-        # Calculs
-        total_value = sum(m.quantity_in_stock * m.purchase_price for m in all_products)
-        total_selling_value = sum(m.quantity_in_stock * m.selling_price for m in all_products)
-        total_items = sum(m.quantity_in_stock for m in all_products)
+        # Calculs (un seul parcours des produits)
+        total_value = 0.0
+        total_selling_value = 0.0
+        total_items = 0
+        for m in all_products:
+            quantity = m.quantity_in_stock
+            total_value += quantity * m.purchase_price
+            total_selling_value += quantity * m.selling_price
+            total_items += quantity
         
         # Regroupement par catégorie
         by_category = self._aggregate_by_category(all_products)
+        today = date.today()
         
         return {
             'generated_at': self._format_datetime(datetime.now()),
@@ -241,7 +255,7 @@ class ReportService:
                     'name': m.name,
                     'quantity': m.quantity_in_stock,
                     'expiration_date': self._format_date(m.expiration_date) if m.expiration_date else 'N/A',
-                    'days_until_expiry': m.days_until_expiry()
+                    'days_until_expiry': m.days_until_expiry(today)
                 }
                 for m in expiring_soon
             ],
@@ -285,23 +299,25 @@ class ReportService:
         for product in products:
             cat = product.category or 'Non catégorisé'
             
-            if cat not in categories:
-                categories[cat] = {
+            entry = categories.get(cat)
+            if entry is None:
+                entry = categories[cat] = {
                     'category': cat,
                     'products_count': 0,
                     'total_items': 0,
                     'total_value': 0.0
                 }
             
-            categories[cat]['products_count'] += 1
-            categories[cat]['total_items'] += product.quantity_in_stock
-            categories[cat]['total_value'] += product.quantity_in_stock * product.purchase_price
+            quantity = product.quantity_in_stock
+            entry['products_count'] += 1
+            entry['total_items'] += quantity
+            entry['total_value'] += quantity * product.purchase_price
         
         # Arrondir les valeurs
         for cat_data in categories.values():
             cat_data['total_value'] = self._round_currency(cat_data['total_value'])
         
-        return sorted(categories.values(), key=lambda x: x['category'])
+        return [categories[cat] for cat in sorted(categories)]
     
     def get_top_products_report(
         self,
@@ -362,7 +378,7 @@ class ReportService:
         if not client:
             return {'error': 'Client non trouvé'}
         
-        sales = self._sale_repo.get_by_client(client_id)
+        sales = self._sale_repo.get_by_client(client_id, include_names=False)
         completed_sales = [s for s in sales if s.status == 'completed']
         
         total_spent = sum(s.total for s in completed_sales)
@@ -400,7 +416,8 @@ class ReportService:
         self,
         medicament_id: int,
         start_date: Optional[date] = None,
-        end_date: Optional[date] = None
+        end_date: Optional[date] = None,
+        include_movements: bool = True
     ) -> Dict[str, Any]:
         """
         Génère un rapport d'historique des mouvements de stock.
@@ -409,6 +426,7 @@ class ReportService:
             medicament_id: ID du médicament
             start_date: Date de début (optionnel)
             end_date: Date de fin (optionnel)
+            include_movements: Inclure le détail des mouvements
             
         Returns:
             dict: Données du rapport
@@ -417,17 +435,14 @@ class ReportService:
         if not medicament:
             return {'error': 'Médicament non trouvé'}
         
-        movements = self._movement_repo.get_by_medicament(medicament_id)
-        
-        # Filtrer par date si spécifié
-        if start_date and end_date:
-            movements = [
-                m for m in movements
-                if start_date <= m.created_at.date() <= end_date
-            ]
-        
-        total_entries = sum(m.quantity for m in movements if m.is_entry())
-        total_exits = sum(abs(m.quantity) for m in movements if m.is_exit())
+        # Totaux calculés par la base, détail chargé seulement si demandé
+        total_entries, total_exits, movements_count = (
+            self._movement_repo.get_totals_by_medicament(medicament_id, start_date, end_date)
+        )
+        movements = (
+            self._movement_repo.get_by_medicament(medicament_id, start_date, end_date)
+            if include_movements else []
+        )
         
         return {
             'medicament': {
@@ -439,13 +454,13 @@ class ReportService:
                 'total_entries': total_entries,
                 'total_exits': total_exits,
                 'net_change': total_entries - total_exits,
-                'movements_count': len(movements)
+                'movements_count': movements_count
             },
             'movements': [
                 {
                     'date': self._format_datetime(m.created_at) if m.created_at else 'N/A',
                     'type': m.movement_type,
-                    'type_label': self._get_movement_type_label(m.movement_type),
+                    'type_label': _MOVEMENT_TYPE_LABELS.get(m.movement_type, m.movement_type),
                     'quantity': m.quantity,
                     'user': m.user_name,
                     'reason': m.reason or 'N/A'
@@ -456,12 +471,7 @@ class ReportService:
     
     def _get_movement_type_label(self, movement_type: str) -> str:
         """Retourne le libellé d'un type de mouvement."""
-        labels = {
-            'entry': 'Entrée',
-            'exit': 'Sortie',
-            'adjustment': 'Ajustement'
-        }
-        return labels.get(movement_type, movement_type)
+        return _MOVEMENT_TYPE_LABELS.get(movement_type, movement_type)
     
     def export_sales_report_csv(
         self,
@@ -478,7 +488,7 @@ class ReportService:
         Returns:
             str: Chemin du fichier généré
         """
-        report = self.get_sales_report(start_date, end_date)
+        sales = self._sale_repo.get_by_date_range(start_date, end_date)
         
         export_dir = self._ensure_export_dir()
         filename = f"ventes_{start_date.isoformat()}_{end_date.isoformat()}.csv"
@@ -487,18 +497,20 @@ class ReportService:
         # En-têtes
         headers = ['Numéro', 'Date', 'Client', 'Vendeur', 'Total', 'Articles', 'Statut']
         
-        # Données
-        rows = []
-        for sale in report['sales']:
-            rows.append([
-                sale['sale_number'],
-                sale['sale_date'],
-                sale['client_name'],
-                sale['seller_name'],
-                str(sale['total']),
-                str(sale['items_count']),
-                sale['status']
-            ])
+        # Données, directement depuis les ventes
+        round_currency = self._round_currency
+        rows = (
+            (
+                s.sale_number,
+                s.sale_date.strftime(_DATETIME_FORMAT),
+                s.client_name or 'Anonyme',
+                s.seller_name,
+                round_currency(s.total),
+                s.get_items_count(),
+                s.status
+            )
+            for s in sales
+        )
         
         # Écriture du fichier
         self._write_csv(filepath, headers, rows)
@@ -512,8 +524,6 @@ class ReportService:
         Returns:
             str: Chemin du fichier généré
         """
-        report = self.get_stock_report()
-        
         export_dir = self._ensure_export_dir()
         filename = f"stock_{date.today().isoformat()}.csv"
         filepath = os.path.join(export_dir, filename)
@@ -524,30 +534,37 @@ class ReportService:
             'Prix Achat', 'Prix Vente', 'Valeur Stock', 'Péremption'
         ]
         
-        # Données
-        rows = []
-        for product in report['all_products']:
-            rows.append([
-                product['code'],
-                product['name'],
-                product['category'],
-                str(product['quantity']),
-                str(product['purchase_price']),
-                str(product['selling_price']),
-                str(product['stock_value']),
-                product['expiration_date']
-            ])
-        
-        # Écriture du fichier
-        self._write_csv(filepath, headers, rows)
+        # Écriture du fichier, ligne par ligne depuis la base
+        self._write_csv(filepath, headers, self._iter_stock_rows())
         
         return filepath
     
+    def _iter_stock_rows(self) -> Iterator[tuple]:
+        """
+        Produit les lignes de l'export stock au fil de la lecture.
+        
+        Yields:
+            tuple: Ligne CSV d'un médicament
+        """
+        for code, name, category, quantity, purchase_price, selling_price, expiration in (
+            self._medicament_repo.iter_stock_rows()
+        ):
+            yield (
+                code,
+                name,
+                category or 'Non catégorisé',
+                quantity,
+                self._round_currency(purchase_price),
+                self._round_currency(selling_price),
+                self._round_currency(quantity * purchase_price),
+                self._format_date(date.fromisoformat(expiration)) if expiration else 'N/A'
+            )
+    
     def _write_csv(
         self, 
         filepath: str, 
         headers: List[str], 
-        rows: List[List[str]]
+        rows: Iterable[Sequence]
     ) -> None:
         """
         Écrit un fichier CSV.
@@ -555,10 +572,8 @@ class ReportService:
         Args:
             filepath: Chemin du fichier
             headers: En-têtes
-            rows: Lignes de données
+            rows: Lignes de données (liste ou itérateur)
         """
-        import csv
-        
         with open(filepath, 'w', newline='', encoding='utf-8-sig') as f:
             writer = csv.writer(f, delimiter=';')
             writer.writerow(headers)
@@ -9,14 +9,11 @@ from typing import Optional, Tuple, List, Dict, Any
 from datetime import datetime
 from dataclasses import dataclass, field
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from models.sale import Sale
 from models.sale_line import SaleLine
 from models.client import Client
 from models.medicament import Medicament
+from models.dataclass_options import DATACLASS_OPTIONS
 from database.sale_repository import SaleRepository
 from database.client_repository import ClientRepository
 from database.medicament_repository import MedicamentRepository
@@ -27,7 +24,7 @@ from utils.format_utils import FormatUtils
 from config import LOYALTY_CONFIG
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class CartItem:
     """Article du panier."""
     medicament: Medicament
@@ -39,27 +36,70 @@ class CartItem:
         return FormatUtils.round_currency(self.quantity * self.unit_price)
 
 
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Cart:
     """Panier de vente."""
     items: List[CartItem] = field(default_factory=list)
     client: Optional[Client] = None
+    # Index des articles par ID de médicament (recherche en O(1))
+    _index: Dict[int, CartItem] = field(default_factory=dict, init=False, repr=False, compare=False)
+    # Totaux tenus à jour par add_item/remove_item/set_quantity
+    _lines_total: float = field(default=0.0, init=False, repr=False, compare=False)
+    _items_count: int = field(default=0, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.recompute()
+    
+    def recompute(self) -> None:
+        """Reconstruit l'index et les totaux à partir des articles."""
+        self._index = {item.medicament.id: item for item in self.items}
+        self._lines_total = sum(item.line_total for item in self.items)
+        self._items_count = sum(item.quantity for item in self.items)
     
     @property
     def subtotal(self) -> float:
-        return FormatUtils.round_currency(
-            sum(item.line_total for item in self.items)
-        )
+        return FormatUtils.round_currency(self._lines_total)
     
     @property
     def items_count(self) -> int:
-        return sum(item.quantity for item in self.items)
+        return self._items_count
     
     def is_empty(self) -> bool:
         return len(self.items) == 0
     
+    def get_item(self, medicament_id: int) -> Optional[CartItem]:
+        return self._index.get(medicament_id)
+    
+    def add_item(self, item: CartItem) -> None:
+        self.items.append(item)
+        self._index[item.medicament.id] = item
+        self._lines_total += item.line_total
+        self._items_count += item.quantity
+    
+    def remove_item(self, medicament_id: int) -> Optional[CartItem]:
+        item = self._index.pop(medicament_id, None)
+        if item is not None:
+            self.items.remove(item)
+            if self.items:
+                self._lines_total -= item.line_total
+                self._items_count -= item.quantity
+            else:
+                self._lines_total = 0.0
+                self._items_count = 0
+        return item
+    
+    def set_quantity(self, item: CartItem, quantity: int) -> None:
+        self._lines_total -= item.line_total
+        self._items_count -= item.quantity
+        item.quantity = quantity
+        self._lines_total += item.line_total
+        self._items_count += quantity
+    
     def clear(self) -> None:
         self.items = []
+        self._index = {}
+        self._lines_total = 0.0
+        self._items_count = 0
         self.client = None
 
 
@@ -114,6 +154,52 @@ class SaleService:
             return False, "La quantité doit être positive"
         
         medicament = self._medicament_repo.get_by_id(medicament_id)
+        return self._add_medicament_to_cart(medicament, quantity)
+    
+    def add_many_to_cart(
+        self,
+        items: List[Tuple[int, int]]
+    ) -> List[Tuple[bool, str]]:
+        """
+        Ajoute plusieurs articles au panier (ex: ordonnance complète).
+        
+        Les médicaments sont chargés en une seule requête.
+        
+        Args:
+            items: Liste de (ID du médicament, quantité)
+            
+        Returns:
+            List[Tuple[bool, str]]: (succès, message) pour chaque article
+        """
+        medicaments = self._medicament_repo.get_by_ids(
+            list({medicament_id for medicament_id, _ in items})
+        )
+        
+        results = []
+        for medicament_id, quantity in items:
+            if quantity <= 0:
+                results.append((False, "La quantité doit être positive"))
+            else:
+                results.append(self._add_medicament_to_cart(
+                    medicaments.get(medicament_id), quantity
+                ))
+        return results
+    
+    def _add_medicament_to_cart(
+        self,
+        medicament: Optional[Medicament],
+        quantity: int
+    ) -> Tuple[bool, str]:
+        """
+        Ajoute au panier un médicament déjà chargé.
+        
+        Args:
+            medicament: Médicament (None si introuvable)
+            quantity: Quantité à ajouter (positive)
+            
+        Returns:
+            Tuple[bool, str]: (succès, message)
+        """
         if medicament is None:
             return False, "Médicament non trouvé"
         
@@ -121,14 +207,8 @@ class SaleService:
             return False, "Ce médicament n'est plus disponible"
         
         # Vérifier le stock
-        current_in_cart = 0
-        existing_item = None
-        
-        for item in self._cart.items:
-            if item.medicament.id == medicament_id:
-                current_in_cart = item.quantity
-                existing_item = item
-                break
+        existing_item = self._cart.get_item(medicament.id)
+        current_in_cart = existing_item.quantity if existing_item else 0
         
         total_needed = current_in_cart + quantity
         
@@ -138,9 +218,9 @@ class SaleService:
         
         # Ajouter ou mettre à jour
         if existing_item:
-            existing_item.quantity += quantity
+            self._cart.set_quantity(existing_item, existing_item.quantity + quantity)
         else:
-            self._cart.items.append(CartItem(
+            self._cart.add_item(CartItem(
                 medicament=medicament,
                 quantity=quantity,
                 unit_price=medicament.selling_price
@@ -158,12 +238,12 @@ class SaleService:
         Returns:
             Tuple[bool, str]: (succès, message)
         """
-        for i, item in enumerate(self._cart.items):
-            if item.medicament.id == medicament_id:
-                removed = self._cart.items.pop(i)
-                return True, f"{removed.medicament.name} retiré du panier"
+        removed = self._cart.remove_item(medicament_id)
+        
+        if removed is None:
+            return False, "Article non trouvé dans le panier"
         
-        return False, "Article non trouvé dans le panier"
+        return True, f"{removed.medicament.name} retiré du panier"
     
     def update_cart_quantity(
         self,
@@ -183,16 +263,16 @@ class SaleService:
         if quantity <= 0:
             return self.remove_from_cart(medicament_id)
         
-        for item in self._cart.items:
-            if item.medicament.id == medicament_id:
-                # Vérifier le stock
-                if item.medicament.quantity_in_stock < quantity:
-                    return False, f"Stock insuffisant. Disponible: {item.medicament.quantity_in_stock}"
-                
-                item.quantity = quantity
-                return True, "Quantité mise à jour"
+        item = self._cart.get_item(medicament_id)
+        if item is None:
+            return False, "Article non trouvé dans le panier"
         
-        return False, "Article non trouvé dans le panier"
+        # Vérifier le stock
+        if item.medicament.quantity_in_stock < quantity:
+            return False, f"Stock insuffisant. Disponible: {item.medicament.quantity_in_stock}"
+        
+        self._cart.set_quantity(item, quantity)
+        return True, "Quantité mise à jour"
     
     def set_client(self, client_id: int) -> Tuple[bool, str]:
         """
@@ -266,13 +346,12 @@ class SaleService:
         if current_user is None:
             return False, "Utilisateur non connecté", None
         
-        # Vérifier les stocks une dernière fois
+        # Vérifier les stocks une dernière fois (une seule requête)
+        stocks = self._medicament_repo.get_stocks_for_ids(
+            [item.medicament.id for item in self._cart.items]
+        )
         for item in self._cart.items:
-            available, stock = self._stock_service.check_stock_availability(
-                item.medicament.id,
-                item.quantity
-            )
-            if not available:
+            if stocks.get(item.medicament.id, 0) < item.quantity:
                 return False, f"Stock insuffisant pour {item.medicament.name}", None
         
         # Calculer les totaux
@@ -305,31 +384,32 @@ class SaleService:
                 )
                 sale.add_line(line)
             
-            # Enregistrer la vente
-            created_sale = self._sale_repo.create(sale)
-            
-            # Mettre à jour les stocks
-            for item in self._cart.items:
-                self._stock_service.remove_stock(
-                    medicament_id=item.medicament.id,
-                    quantity=item.quantity,
+            # Enregistrer la vente, les stocks et le client en une transaction
+            with self._sale_repo.db.transaction():
+                created_sale = self._sale_repo.create(sale)
+                
+                # Mettre à jour les stocks
+                success, message = self._stock_service.remove_stocks(
+                    [(item.medicament.id, item.quantity) for item in self._cart.items],
                     reason="Vente",
                     reference_id=created_sale.id
                 )
-            
-            # Mettre à jour le client si associé
-            if self._cart.client:
-                # Ajouter les points
-                self._loyalty_service.add_points_to_client(
-                    self._cart.client.id,
-                    totals['total']
-                )
+                if not success:
+                    raise ValueError(message)
                 
-                # Mettre à jour le total dépensé
-                self._client_repo.update_total_spent(
-                    self._cart.client.id,
-                    totals['total']
-                )
+                # Mettre à jour le client si associé
+                if self._cart.client:
+                    # Ajouter les points
+                    self._loyalty_service.add_points_to_client(
+                        self._cart.client.id,
+                        totals['total']
+                    )
+                    
+                    # Mettre à jour le total dépensé
+                    self._client_repo.update_total_spent(
+                        self._cart.client.id,
+                        totals['total']
+                    )
             
             # Vider le panier
             self._cart.clear()
@@ -8,10 +8,6 @@ Version: 1.0
 from typing import Optional, Tuple, List
 from datetime import date
 
-import sys
-import os
-sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-
 from models.medicament import Medicament
 from models.stock_movement import StockMovement
 from database.medicament_repository import MedicamentRepository
@@ -299,6 +295,50 @@ class StockService:
         else:
             return False, "Erreur lors de la mise à jour du stock"
     
+    def remove_stocks(
+        self,
+        quantities: List[Tuple[int, int]],
+        reason: str = "Sortie manuelle",
+        reference_id: int = None
+    ) -> Tuple[bool, str]:
+        """
+        Retire du stock pour plusieurs médicaments à la fois.
+        
+        Les mises à jour et les mouvements sont écrits en deux requêtes
+        groupées; à appeler dans une transaction pour garantir que tout
+        ou rien n'est enregistré.
+        
+        Args:
+            quantities: Liste de tuples (ID du médicament, quantité)
+            reason: Motif
+            reference_id: ID de référence (ex: vente)
+            
+        Returns:
+            Tuple[bool, str]: (succès, message)
+        """
+        if any(quantity <= 0 for _, quantity in quantities):
+            return False, "La quantité doit être positive"
+        
+        if not self._medicament_repo.decrement_stocks(quantities):
+            return False, "Stock insuffisant"
+        
+        current_user = AuthService.get_current_user()
+        user_id = current_user.id if current_user else 1
+        
+        self._movement_repo.create_many([
+            StockMovement(
+                medicament_id=medicament_id,
+                user_id=user_id,
+                movement_type=MovementType.EXIT,
+                quantity=-quantity,
+                reference_id=reference_id,
+                reason=reason
+            )
+            for medicament_id, quantity in quantities
+        ])
+        
+        return True, "Stocks mis à jour"
+    
     def adjust_stock(
         self,
         medicament_id: int,
@@ -426,9 +466,4 @@ class StockService:
         Returns:
             dict: Statistiques
         """
-        return {
-            'total_products': self._medicament_repo.count_total(),
-            'low_stock_count': self._medicament_repo.count_low_stock(),
-            'expiring_soon_count': self._medicament_repo.count_expiring_soon(),
-            'total_value': self._medicament_repo.get_total_stock_value()
-        }
\ No newline at end of file
+        return self._medicament_repo.get_stock_summary()
\ No newline at end of file
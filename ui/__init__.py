@@ -1,18 +1,25 @@
 """
 Module UI - Interface utilisateur Tkinter.
 
+Les vues sont importées à la demande (PEP 562) : l'écran de connexion
+ne charge ainsi pas toute l'arborescence de la fenêtre principale.
+
 Auteur: Alsény Camara
 Version: 1.0
 """
 
-from .login_view import LoginView
-from .main_window import MainWindow
-from .dashboard_view import DashboardView
-from .medicament_view import MedicamentView
-from .client_view import ClientView
-from .sale_view import SaleView
-from .user_view import UserView
-from .report_view import ReportView
+import importlib
+
+_VIEWS = {
+    'LoginView': 'login_view',
+    'MainWindow': 'main_window',
+    'DashboardView': 'dashboard_view',
+    'MedicamentView': 'medicament_view',
+    'ClientView': 'client_view',
+    'SaleView': 'sale_view',
+    'UserView': 'user_view',
+    'ReportView': 'report_view'
+}
 
 __all__ = [
     'LoginView',
@@ -23,4 +30,15 @@ __all__ = [
     'SaleView',
     'UserView',
     'ReportView'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    """Importe la vue demandée lors du premier accès."""
+    module_name = _VIEWS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    
+    view = getattr(importlib.import_module(f".{module_name}", __name__), name)
+    globals()[name] = view
+    return view
\ No newline at end of file
@@ -7,7 +7,7 @@ Version: 1.0
 
 import csv
 import os
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable, Sequence
 from datetime import datetime
 
 
@@ -83,6 +83,51 @@ class CSVExporter:
             print(f"Erreur lors de l'export CSV: {e}")
             return False
     
+    @staticmethod
+    def export_rows(
+        rows: Iterable[Sequence[Any]],
+        filepath: str,
+        headers: List[str],
+        encoding: str = DEFAULT_ENCODING,
+        delimiter: str = DEFAULT_DELIMITER
+    ) -> bool:
+        """
+        Exporte des lignes (tuples) vers un fichier CSV au fil de l'eau.
+        
+        Les lignes peuvent provenir d'un générateur: elles sont écrites
+        sans construire de liste intermédiaire.
+        
+        Args:
+            rows: Lignes à exporter, dans l'ordre des en-têtes
+            filepath: Chemin du fichier de destination
+            headers: En-têtes des colonnes
+            encoding: Encodage du fichier
+            delimiter: Délimiteur de colonnes
+            
+        Returns:
+            bool: True si export réussi
+        """
+        try:
+            # Créer le répertoire si nécessaire
+            directory = os.path.dirname(filepath)
+            if directory and not os.path.exists(directory):
+                os.makedirs(directory)
+            
+            format_value = CSVExporter._format_value
+            
+            with open(filepath, 'w', newline='', encoding=encoding) as csvfile:
+                writer = csv.writer(csvfile, delimiter=delimiter)
+                writer.writerow(headers)
+                writer.writerows(
+                    [format_value(value) for value in row] for row in rows
+                )
+            
+            return True
+            
+        except Exception as e:
+            print(f"Erreur lors de l'export CSV: {e}")
+            return False
+    
     @staticmethod
     def _format_value(value: Any) -> str:
         """
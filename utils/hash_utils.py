@@ -59,10 +59,28 @@ class HashUtils:
         Returns:
             bool: True si le mot de passe correspond
         """
-        if not password or not password_hash:
+        if not password:
             return False
         
-        computed_hash = HashUtils.hash_password(password)
+        return HashUtils.verify_hash(HashUtils.hash_password(password), password_hash)
+    
+    @staticmethod
+    def verify_hash(computed_hash: str, password_hash: str) -> bool:
+        """
+        Compare un hash déjà calculé au hash stocké.
+        
+        Permet de calculer le hash du mot de passe saisi indépendamment
+        de la lecture du hash stocké en base.
+        
+        Args:
+            computed_hash: Hash du mot de passe saisi
+            password_hash: Hash stocké
+            
+        Returns:
+            bool: True si les hash correspondent
+        """
+        if not computed_hash or not password_hash:
+            return False
         
         # Comparaison sécurisée (timing-safe)
         return secrets.compare_digest(computed_hash, password_hash)